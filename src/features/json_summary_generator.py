@@ -1,6 +1,6 @@
 # src/features/json_summary_generator.py
-import json
 import os
+import orjson
 from datetime import datetime
 
 from src.utils.config import JSON_SUMMARY_DIR, PLOT_DIR
@@ -18,7 +18,11 @@ class JsonSummaryGenerator:
     durch ein LLM und die finale HTML-Generierung optimiert ist.
     """
 
-    def generate_and_save_complete_summary(self, analysis_results: dict, content_summary: dict, epic_id: str) -> dict:
+    # Wird bei jeder inkompatiblen Änderung der Struktur erhöht; gecachte
+    # Zusammenfassungen mit abweichender Version werden verworfen.
+    SCHEMA_VERSION = "v3"
+
+    def generate_and_save_complete_summary(self, analysis_results: dict, content_summary: dict, epic_id: str, export_json: bool = True) -> dict:
         """
         Fusioniert die metrischen Analyseergebnisse mit der inhaltlichen
         Zusammenfassung und speichert sie als eine einzige JSON-Datei.
@@ -27,6 +31,8 @@ class JsonSummaryGenerator:
             analysis_results (dict): Die Ergebnisse aus dem AnalysisRunner.
             content_summary (dict): Die inhaltliche Zusammenfassung aus dem LLM-Aufruf.
             epic_id (str): Die ID des Business Epics.
+            export_json (bool): Wenn False, wird keine JSON-Datei geschrieben
+                (z.B. wenn die Zusammenfassung im SummaryCache landet).
 
         Returns:
             dict: Das fusionierte, vollständige Dictionary.
@@ -39,15 +45,19 @@ class JsonSummaryGenerator:
         # 2. Inhaltliche Zusammenfassung und metrische Analyse fusionieren
         # Beginne mit der inhaltlichen Zusammenfassung und füge die metrische Analyse hinzu,
         # um die Top-Level-Struktur von content_summary zu erhalten.
-        complete_data = content_summary.copy()
+        complete_data = {"schema_version": self.SCHEMA_VERSION}
+        complete_data.update(content_summary)
         complete_data.update(metric_summary) # Fügt die Schlüssel aus metric_summary hinzu
 
+        if not export_json:
+            return complete_data
+
         # 3. Pfad für die Ausgabedatei definieren
         output_path = os.path.join(JSON_SUMMARY_DIR, f"{epic_id}_complete_summary.json")
 
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(complete_data, f, ensure_ascii=False, indent=2)
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(complete_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
             logger.info(f"Vollständige JSON-Zusammenfassung erfolgreich gespeichert: {output_path}")
         except Exception as e:
             logger.error(f"Fehler beim Speichern der vollständigen JSON-Zusammenfassung für {epic_id}: {e}")
@@ -3,12 +3,20 @@
 import os
 import re
 import sys
-import json
+import mmap
+import pickle
+import functools
+import asyncio
+import orjson
 import argparse
 import yaml
-import time
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml-Parser, deutlich schneller
+except ImportError:
+    from yaml import SafeLoader
 import threading
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Fügen Sie das übergeordnete Verzeichnis (Projekt-Root) zum Suchpfad hinzu...
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -20,10 +28,11 @@ from utils.jira_tree_classes import JiraTreeGenerator, JiraTreeVisualizer, JiraC
 from utils.azure_ai_client import AzureAIClient
 from utils.epic_html_generator import EpicHtmlGenerator
 from utils.token_usage_class import TokenUsage
-from utils.logger_config import logger
+from utils.logger_config import logger, progress_logger
 from utils.json_parser import LLMJsonParser
 from utils.html_translator import HtmlTranslator
 from utils.project_data_provider import ProjectDataProvider
+from utils.summary_cache import SummaryCache
 from features.console_reporter import ConsoleReporter
 from features.json_summary_generator import JsonSummaryGenerator
 
@@ -54,7 +63,9 @@ from utils.config import (
     JIRA_TREE_MANAGEMENT,
     JIRA_TREE_MANAGEMENT_LIGHT,
     JIRA_TREE_FULL,
-    MAX_JIRA_TREE_CONTEXT_SIZE
+    MAX_JIRA_TREE_CONTEXT_SIZE,
+    MAX_EPIC_WORKERS,
+    RETRY_BATCH_SIZE
 )
 
 # Zentrale Liste der zu verwendenden Analyzer
@@ -66,78 +77,82 @@ ANALYZERS_TO_RUN = [
     BacklogAnalyzer
 ]
 
+# Schlüssel, die in der Zusammenfassung vorangestellt werden
+SUMMARY_HEAD_KEYS = frozenset({"epicId", "title", "status", "target_start", "target_end", "fix_versions"})
 
-def prevent_screensaver(stop_event):
-    """
-    Läuft in einem separaten Thread und drückt alle 8 Minuten die Leertaste via
-    AppleScript, um den System-Bildschirmschoner zu verhindern.
-    """
-    logger.info("Keep-Awake-Thread gestartet. Drückt alle 8 Minuten die Leertaste.")
-    while not stop_event.is_set():
-        if stop_event.wait(480):
-            break
-        if not stop_event.is_set():
-            try:
-                script = 'tell application "System Events" to key code 49'
-                subprocess.run(['osascript', '-e', script], check=True, capture_output=True)
-                logger.info("Keep-Awake: Leertaste gedrückt, um den Bildschirmschoner zu verhindern.")
-            except subprocess.CalledProcessError as e:
-                logger.error(f"Keep-Awake-Fehler: AppleScript konnte nicht ausgeführt werden. {e}")
-            except FileNotFoundError:
-                logger.error("Keep-Awake-Fehler: 'osascript' Befehl nicht gefunden. Nur auf macOS verfügbar.")
-                break
-    logger.info("Keep-Awake-Thread wurde beendet.")
+# Ab dieser Dateigröße wird die BE-Liste per mmap statt zeilenweise gelesen
+MMAP_MIN_FILE_SIZE = 64 * 1024
+
+# Jira-Key (z.B. BEMABU-1234), einmalig kompiliert für BE-Liste, Retry-Log und Server-Modus
+_JIRA_KEY_RE = re.compile(rb'[A-Z][A-Z0-9]*-\d+')
 
-def perform_final_retry(azure_client, token_tracker):
+# pyplot ist nicht threadsicher: Grafiken werden seriell erzeugt
+_PLOT_LOCK = threading.Lock()
+_thread_local = threading.local()
+
+
+def perform_final_retry(azure_client, token_tracker, scraper=None):
     """
     Liest hartnäckig fehlgeschlagene Issues aus einer Log-Datei
     und versucht einen letzten, gezielten Scraping-Durchlauf für diese.
+
+    Ein bereits eingeloggter Scraper aus einem vorherigen Scraping-Lauf kann
+    über `scraper` wiederverwendet werden; sonst wird ein neuer angelegt.
     """
     if not os.path.exists(ISSUE_LOG_FILE) or os.path.getsize(ISSUE_LOG_FILE) == 0:
         logger.info("Keine fehlgeschlagenen Issues in der Log-Datei gefunden. Überspringe finalen Retry.")
         return
     logger.info(f"--- Starte finalen Retry-Versuch für Issues aus '{ISSUE_LOG_FILE}' ---")
-    with open(ISSUE_LOG_FILE, 'r') as f:
-        failed_keys = [line.strip() for line in f if line.strip()]
-
     # Extrahiere nur gültige Jira-Keys, um fehlerhafte Zeilen zu ignorieren
-    key_pattern = re.compile(r'([A-Z][A-Z0-9]*-\d+)')
-    valid_failed_keys = []
-    for line in failed_keys:
-        match = key_pattern.search(line)
-        if match:
-            valid_failed_keys.append(match.group(1))
+    with open(ISSUE_LOG_FILE, 'rb') as f:
+        valid_failed_keys = list(dict.fromkeys(m.decode() for m in _JIRA_KEY_RE.findall(f.read())))
 
     if not valid_failed_keys:
         logger.info("Log-Datei enthält keine gültigen Jira-Keys. Kein Retry notwendig.")
         return
 
-    retry_scraper = JiraScraper(
-        f"https://jira.telekom.de/browse/{valid_failed_keys[0]}", JIRA_EMAIL,
-        model=LLM_MODEL_BUSINESS_VALUE, token_tracker=token_tracker,
-        azure_client=azure_client, scrape_mode='true', check_days=0
-    )
-
-    # Rufe die saubere, gekapselte Login-Methode des Scrapers auf
-    if not retry_scraper.login():
-        logger.error("Login für den finalen Retry-Versuch fehlgeschlagen. Breche ab.")
-        return
+    if scraper is not None:
+        retry_scraper = scraper
+        # Im Retry-Durchlauf bereits als verarbeitet markierte Keys wieder freigeben
+        retry_scraper.processed_issues.difference_update(valid_failed_keys)
+    else:
+        retry_scraper = JiraScraper(
+            f"https://jira.telekom.de/browse/{valid_failed_keys[0]}", JIRA_EMAIL,
+            model=LLM_MODEL_BUSINESS_VALUE, token_tracker=token_tracker,
+            azure_client=azure_client, scrape_mode='true', check_days=0
+        )
+
+        # Rufe die saubere, gekapselte Login-Methode des Scrapers auf
+        if not retry_scraper.login():
+            logger.error("Login für den finalen Retry-Versuch fehlgeschlagen. Breche ab.")
+            return
 
-    # Ab hier wird der initialisierte self.driver aus dem Scraper verwendet
+    # Fehlgeschlagene Issues gebündelt per JQL-Suche laden; nur Keys, die die
+    # Suche nicht liefert, werden anschließend einzeln nachgeladen.
     successful_retries, persistent_failures = [], []
-    for key in valid_failed_keys:
-        logger.info(f"Dritter Versuch für Issue: {key}")
-        url = f"https://jira.telekom.de/browse/{key}"
-        # Diese Methode verwendet jetzt den im Scraper initialisierten Driver
-        issue_data = retry_scraper.extract_and_save_issue_data(url, key)
-        if issue_data:
-            logger.info(f"Issue {key} im dritten Anlauf erfolgreich verarbeitet.")
-            successful_retries.append(key)
-        else:
-            logger.warning(f"Issue {key} konnte auch im dritten Anlauf nicht verarbeitet werden.")
-            persistent_failures.append(key)
-
-    retry_scraper.login_handler.close()
+    for start in range(0, len(valid_failed_keys), RETRY_BATCH_SIZE):
+        batch = valid_failed_keys[start:start + RETRY_BATCH_SIZE]
+        try:
+            fetched = retry_scraper._batch_fetch(batch)
+        except Exception as e:
+            logger.warning(f"Batch-Abruf für {len(batch)} Issues fehlgeschlagen ({e}). Lade einzeln.")
+            fetched = {}
+
+        for key in batch:
+            issue_data = fetched.get(key)
+            if issue_data is None:
+                logger.info(f"Dritter Versuch für Issue: {key}")
+                url = f"https://jira.telekom.de/browse/{key}"
+                issue_data = retry_scraper.extract_and_save_issue_data(url, key)
+            if issue_data:
+                logger.info(f"Issue {key} im dritten Anlauf erfolgreich verarbeitet.")
+                successful_retries.append(key)
+            else:
+                logger.warning(f"Issue {key} konnte auch im dritten Anlauf nicht verarbeitet werden.")
+                persistent_failures.append(key)
+
+    # Einen übergebenen Scraper schließt der Aufrufer
+    if scraper is None and retry_scraper.login_handler: retry_scraper.login_handler.close()
 
     with open(ISSUE_LOG_FILE, 'w') as f:
         for key in persistent_failures: f.write(f"{key}\n")
@@ -147,12 +162,13 @@ def perform_final_retry(azure_client, token_tracker):
     logger.info(f"Endgültig fehlgeschlagen: {len(persistent_failures)}")
 
 
+@functools.lru_cache(maxsize=None)
 def load_prompt(filename, key):
     """Lädt einen Prompt aus einer YAML-Datei im PROMPTS_DIR."""
     file_path = os.path.join(PROMPTS_DIR, filename)
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
-            prompts = yaml.safe_load(file)
+            prompts = yaml.load(file, Loader=SafeLoader)
             return prompts[key]
     except (FileNotFoundError, KeyError) as e:
         logger.error(f"Fehler beim Laden des Prompts: {e}")
@@ -173,17 +189,335 @@ def get_business_epics_from_file(file_path=None):
         print(f"FEHLER: Die Datei {file_to_try} existiert nicht.")
         return []
 
-    business_epics = []
-    epic_id_pattern = re.compile(r'[A-Z][A-Z0-9]*-\d+')
-
-    with open(file_to_try, 'r', encoding='utf-8') as file:
-        for line in file:
-            match = epic_id_pattern.search(line)
-            if match:
-                business_epics.append(match.group(0))
+    # Ein einziger Regex-Durchlauf über den gesamten Dateiinhalt;
+    # große Listen werden dafür gemappt statt eingelesen
+    with open(file_to_try, 'rb') as file:
+        if os.path.getsize(file_to_try) >= MMAP_MIN_FILE_SIZE:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                business_epics = [m.decode() for m in _JIRA_KEY_RE.findall(mm)]
+        else:
+            business_epics = [m.decode() for m in _JIRA_KEY_RE.findall(file.read())]
 
     print(f"{len(business_epics)} Business Epics gefunden.")
-    return business_epics
+    unique_epics = list(dict.fromkeys(business_epics))
+    if len(unique_epics) != len(business_epics):
+        logger.info(f"{len(business_epics) - len(unique_epics)} doppelte Epic-IDs entfernt.")
+    return unique_epics
+
+def _get_summary_client():
+    """Liefert den AzureAIClient für Summaries des aktuellen Worker-Threads."""
+    client = getattr(_thread_local, "summary_client", None)
+    if client is None:
+        client = AzureAIClient()
+        _thread_local.summary_client = client
+    return client
+
+async def _analyze_and_build_tree(analysis_runner, data_provider, epic):
+    """Führt die metrischen Analysen und den Baumaufbau für ein Epic gleichzeitig aus."""
+    tree_generator_full = JiraTreeGenerator(allowed_types=JIRA_TREE_MANAGEMENT)
+    return await asyncio.gather(
+        asyncio.to_thread(analysis_runner.run_analyses, data_provider),
+        asyncio.to_thread(tree_generator_full.build_issue_tree, epic)
+    )
+
+def process_epic(epic, args, token_tracker, visualizer, context_generator, html_generator,
+                 json_parser, analysis_runner, json_summary_generator, reporter, summary_cache):
+    """
+    Analyse, Zusammenfassung, HTML-Report und Übersetzung für ein einzelnes
+    Business Epic. Wird parallel in einem Worker-Thread ausgeführt.
+    """
+    progress_logger.info(f"--- Starte Verarbeitung für {epic} ---")
+    complete_epic_data = None
+    complete_summary_path = os.path.join(JSON_SUMMARY_DIR, f"{epic}_complete_summary.json")
+
+    complete_summary_pickle_path = os.path.join(JSON_SUMMARY_DIR, f"{epic}_complete_summary.pkl")
+
+    # Schritt 1: Prüfen, ob eine gecachte Zusammenfassung verwendet werden soll ('check'-Modus)
+    # Pickle-Schatten zuerst (nur mit --pickle-cache, da Pickle nur für eigene Dateien vertrauenswürdig ist)
+    if args.html_summary == 'check' and args.pickle_cache and os.path.exists(complete_summary_pickle_path):
+        try:
+            with open(complete_summary_pickle_path, 'rb') as f:
+                complete_epic_data = pickle.load(f)
+            logger.info(f"Lade vollständige Zusammenfassung aus Pickle-Cache: {complete_summary_pickle_path}")
+        except (pickle.UnpicklingError, EOFError, IOError) as e:
+            logger.info(f"Konnte Pickle-Cache nicht lesen ({e}).")
+
+    if args.html_summary == 'check' and complete_epic_data is None:
+        complete_epic_data = summary_cache.get(epic)
+        if complete_epic_data is not None:
+            logger.info(f"Lade vollständige Zusammenfassung für {epic} aus dem Summary-Cache.")
+
+    # Fallback auf Legacy-JSON-Dateien aus früheren Läufen
+    if args.html_summary == 'check' and complete_epic_data is None and os.path.exists(complete_summary_path):
+        logger.info(f"Lade vollständige Zusammenfassung aus Cache: {complete_summary_path}")
+        try:
+            with open(complete_summary_path, 'rb') as f:
+                complete_epic_data = orjson.loads(f.read())
+        except (orjson.JSONDecodeError, IOError) as e:
+            logger.info(f"Konnte Cache-Datei nicht lesen ({e}). Erstelle Zusammenfassung neu.")
+
+    # Nur Zusammenfassungen im aktuellen Schema verwenden, veraltete Einträge entfernen
+    if complete_epic_data is not None and complete_epic_data.get("schema_version") != JsonSummaryGenerator.SCHEMA_VERSION:
+        logger.info(f"Gecachte Zusammenfassung für {epic} hat ein veraltetes Schema ({complete_epic_data.get('schema_version')}). Verwerfe Cache.")
+        summary_cache.delete(epic)
+        for stale_path in (complete_summary_path, complete_summary_pickle_path):
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
+        complete_epic_data = None
+
+    # Schritt 2: Wenn keine Cache-Datei vorhanden oder '--html_summary true', alles neu generieren
+    if complete_epic_data is None:
+        logger.info("Keine gültige Cache-Datei gefunden oder Neuerstellung erzwungen. Generiere alle Daten...")
+
+        # 2a: Metrische Analysen durchführen
+        data_provider = ProjectDataProvider(epic_id=epic, hierarchy_config=JIRA_TREE_FULL)
+        if not data_provider.is_valid():
+            logger.error(f"Fehler: Konnte keine gültigen Daten für Analyse von Epic '{epic}' laden. Verarbeitung wird übersprungen.")
+            return
+        # Analysen und Aufbau des Management-Baums sind unabhängig voneinander und laufen parallel
+        progress_logger.info(f"Erstelle Analyse und vollständigen Baum (JIRA_TREE_MANAGEMENT) für {epic}")
+        analysis_results, issue_tree_for_visualization = asyncio.run(
+            _analyze_and_build_tree(analysis_runner, data_provider, epic)
+        )
+        with _PLOT_LOCK:
+            reporter.create_backlog_plot(analysis_results.get("BacklogAnalyzer", {}), epic)
+
+        # 2b: Inhaltliche Zusammenfassung per LLM erstellen
+
+        if issue_tree_for_visualization:
+            with _PLOT_LOCK:
+                visualizer.visualize(issue_tree_for_visualization, epic)
+        else:
+            logger.warning(f"Konnte keinen Baum für die Visualisierung von {epic} erstellen. Die Grafik wird im Report fehlen.")
+
+        issue_tree_for_context = issue_tree_for_visualization
+
+        if issue_tree_for_context and len(issue_tree_for_context) > MAX_JIRA_TREE_CONTEXT_SIZE:
+            logger.info(f"Management-Baum für LLM-Kontext von {epic} ist mit {len(issue_tree_for_context)} Knoten zu groß (Max: {MAX_JIRA_TREE_CONTEXT_SIZE}). Reduziere auf LIGHT-Hierarchie.")
+            tree_generator_light = JiraTreeGenerator(allowed_types=JIRA_TREE_MANAGEMENT_LIGHT)
+            issue_tree_for_context = tree_generator_light.build_issue_tree(epic)
+
+        if not issue_tree_for_context:
+            logger.warning(f"Konnte keinen gültigen Baum für die LLM-Kontext-Generierung von {epic} erstellen. Überspringe Summary-Generierung.")
+            return
+
+        json_context = context_generator.generate_context(issue_tree_for_context, epic)
+        summary_prompt_template = load_prompt("summary_prompt.yaml", "user_prompt_template")
+        summary_prompt = summary_prompt_template.format(json_context=json_context)
+        progress_logger.info(f"Erstelle Summary für {epic}")
+        response_data = _get_summary_client().completion(
+            model_name=LLM_MODEL_SUMMARY,
+            user_prompt=summary_prompt,
+            max_tokens=20000,
+            response_format={"type": "json_object"},
+            use_cache=True
+        )
+
+        if token_tracker and "usage" in response_data:
+            usage = response_data["usage"]
+            token_tracker.log_usage(model=LLM_MODEL_SUMMARY, input_tokens=usage.prompt_tokens, output_tokens=usage.completion_tokens, total_tokens=usage.total_tokens, task_name=f"summary_generation")
+            # Anteil der Prompt-Tokens, die aus dem serverseitigen Prompt-Cache kamen
+            cached_tokens = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+            if cached_tokens is not None:
+                logger.info(f"Summary für {epic}: {cached_tokens}/{usage.prompt_tokens} Prompt-Tokens aus dem Prompt-Cache.")
+
+        content_summary = json_parser.extract_and_parse_json(response_data["text"])
+        epic_meta = data_provider.issue_details.get(epic, {})
+        ordered_content_summary = {
+            "epicId": content_summary.get("epicId"),
+            "title": content_summary.get("title"),
+            "status": epic_meta.get('status', 'Unbekannt'),
+            "target_start": epic_meta.get('target_start', 'Unbekannt'),
+            "target_end": epic_meta.get('target_end', 'Unbekannt'),
+            "fix_versions": epic_meta.get('fix_versions', 'Unbekannt')
+        }
+        for k, v in content_summary.items():
+            if k not in SUMMARY_HEAD_KEYS:
+                ordered_content_summary[k] = v
+        content_summary = ordered_content_summary
+
+        # 2c: Alle Daten fusionieren und als eine JSON-Datei speichern
+        complete_epic_data = json_summary_generator.generate_and_save_complete_summary(analysis_results=analysis_results, content_summary=content_summary, epic_id=epic, export_json=args.export_json)
+        # Ein fehlgeschlagener Cache-Eintrag darf den HTML-Report nicht verhindern
+        try:
+            summary_cache.set(epic, complete_epic_data)
+        except Exception as e:
+            logger.error(f"Fehler beim Speichern der Zusammenfassung für {epic} im Summary-Cache: {e}")
+        if args.pickle_cache:
+            with open(complete_summary_pickle_path, 'wb') as f:
+                pickle.dump(complete_epic_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            # Einen alten Pickle-Schatten entfernen, sonst würde er bei einem späteren
+            # Lauf mit --pickle-cache der neueren Zusammenfassung vorgezogen
+            try:
+                os.remove(complete_summary_pickle_path)
+            except FileNotFoundError:
+                pass
+
+    # Schritt 3: HTML-Datei aus den vollständigen Daten (neu oder aus Cache) erstellen
+    if complete_epic_data:
+        progress_logger.info(f"Erstelle HTML-Report für {epic}...")
+        html_file = os.path.join(HTML_REPORTS_DIR, f"{epic}_summary.html")
+        html_generator.generate_epic_html(complete_epic_data, epic, html_file)
+    else:
+        logger.error(f"Konnte keine vollständigen Daten für die HTML-Erstellung von {epic} erzeugen.")
+    
+    if args.translate != 'false':
+        # Eigener AI Client für den Übersetzer, da der System-Prompt spezialisiert ist.
+        # Der HtmlTranslator setzt den korrekten System-Prompt selbst.
+        azure_translator_client = AzureAIClient()
+        html_translator = HtmlTranslator(
+            ai_client=azure_translator_client,
+            token_tracker=token_tracker,
+            model_name=LLM_MODEL_TRANSLATOR
+        )
+
+        german_html_path = os.path.join(HTML_REPORTS_DIR, f"{epic}_summary.html")
+        english_html_path = os.path.join(HTML_REPORTS_DIR, f"{epic}_summary_englisch.html")
+
+        # WICHTIG: Prüfen, ob die deutsche Quelldatei existiert.
+        if not os.path.exists(german_html_path):
+            logger.warning(f"Übersetzung für {epic} übersprungen, da die deutsche HTML-Datei nicht existiert.")
+        else:
+            run_translation = False
+            if args.translate == 'true':
+                run_translation = True
+                logger.info(f"Übersetzung für {epic} wird erzwungen ('--translate true').")
+
+            elif args.translate == 'check':
+                if not os.path.exists(english_html_path):
+                    run_translation = True
+                    logger.info(f"Englische Version für {epic} existiert nicht. Starte Übersetzung ('--translate check').")
+                else:
+                    logger.info(f"Englische Version für {epic} existiert bereits. Übersetzung wird übersprungen.")
+
+            if run_translation:
+                try:
+                    progress_logger.info(f"Übersetze HTML-File für {epic}")
+                    html_translator.translate_file(epic)
+                except Exception as e:
+                    logger.error(f"Fehler bei der Übersetzung von {epic}: {e}")
+
+def _create_scraper(business_epic, args, token_tracker):
+    """Legt den JiraScraper samt Client für die Business-Value-Extraktion an (ohne Login)."""
+    business_value_system_prompt = load_prompt("business_value_prompt.yaml", "system_prompt")
+    azure_extraction_client = AzureAIClient(system_prompt=business_value_system_prompt)
+    scraper = JiraScraper(
+        f"https://jira.telekom.de/browse/{business_epic}", JIRA_EMAIL,
+        model=LLM_MODEL_BUSINESS_VALUE, token_tracker=token_tracker,
+        azure_client=azure_extraction_client, scrape_mode=args.scraper,
+        check_days=SCRAPER_CHECK_DAYS
+    )
+    return scraper, azure_extraction_client
+
+def _create_reporting_tools(token_tracker):
+    """
+    Legt die über alle Epics geteilten Clients und Generatoren für Analyse und
+    Reporting an, in der Reihenfolge der Parameter von `process_epic`
+    (der AzureAIClient für Summaries wird pro Worker-Thread angelegt).
+    """
+    return (
+        JiraTreeVisualizer(format='png'),
+        JiraContextGenerator(),
+        EpicHtmlGenerator(model=LLM_MODEL_HTML_GENERATOR, token_tracker=token_tracker),
+        LLMJsonParser(),
+        AnalysisRunner(ANALYZERS_TO_RUN),
+        JsonSummaryGenerator(),
+        ConsoleReporter(),
+        SummaryCache(),
+    )
+
+def process_business_epics(business_epics, args, token_tracker, scraper=None, reporting_tools=None, executor=None):
+    """
+    Führt Scraping, Analyse, Reporting und Übersetzung für eine Liste von
+    Business Epics gemäß den Kommandozeilen-Argumenten aus.
+
+    Im Server-Modus übergibt der Aufrufer einen bereits eingeloggten Scraper,
+    die Reporting-Werkzeuge und den Thread-Pool, damit diese über alle Epics
+    wiederverwendet werden; er schließt sie anschließend auch selbst.
+    """
+    if args.scraper != 'false':
+        print(f"\n--- Scraping-Modus gestartet (Mode: {args.scraper}) ---")
+        owns_scraper = scraper is None
+        if owns_scraper:
+            scraper, azure_extraction_client = _create_scraper(business_epics[0], args, token_tracker)
+
+        for i, epic in enumerate(business_epics):
+            progress_logger.info(f"Verarbeite Business Epic {i+1}/{len(business_epics)}: {epic}")
+            scraper.url = f"https://jira.telekom.de/browse/{epic}"
+            scraper.processed_issues.clear()
+            scraper.run(skip_login=(i > 0 or not owns_scraper))
+        if owns_scraper:
+            if args.retry_failed:
+                # Fehlgeschlagene Issues direkt mit dem eingeloggten Scraper erneut laden
+                perform_final_retry(azure_extraction_client, token_tracker, scraper=scraper)
+            if scraper.login_handler: scraper.login_handler.close()
+    else:
+        print("\n--- Scraping übersprungen (Mode: 'false') ---")
+        if args.retry_failed:
+            business_value_system_prompt = load_prompt("business_value_prompt.yaml", "system_prompt")
+            perform_final_retry(AzureAIClient(system_prompt=business_value_system_prompt), token_tracker)
+
+    # +++ VEREINHEITLICHTE LOGIK FÜR ANALYSE UND REPORTING +++
+    if args.html_summary != 'false':
+        print("\n--- Analyse / Reporting gestartet ---")
+
+        owns_tools = reporting_tools is None
+        if owns_tools:
+            reporting_tools = _create_reporting_tools(token_tracker)
+        owns_executor = executor is None
+        if owns_executor:
+            executor = ThreadPoolExecutor(max_workers=MAX_EPIC_WORKERS)
+
+        try:
+            futures = {
+                executor.submit(process_epic, epic, args, token_tracker, *reporting_tools): epic
+                for epic in business_epics
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Fehler bei der Verarbeitung von {futures[future]}: {e}", exc_info=True)
+        finally:
+            if owns_executor:
+                executor.shutdown()
+            if owns_tools:
+                # Die SummaryCache ist das letzte Werkzeug
+                reporting_tools[-1].close()
+    else:
+        print("\n--- Analyse und HTML-Summary übersprungen ---")
+
+
+def _run_server(args, token_tracker):
+    """
+    Server-Modus: Der Prozess bleibt aktiv und verarbeitet Epic-IDs zeilenweise
+    von stdin. Scraper (einmal eingeloggt), Clients, Summary-Cache und
+    Thread-Pool werden einmal angelegt und für alle Epics wiederverwendet.
+    """
+    print("\n--- Server-Modus: Lese Epic-IDs von stdin ---")
+    scraper = None
+    if args.scraper != 'false':
+        scraper, _ = _create_scraper("", args, token_tracker)
+        if not scraper.login():
+            print("Login fehlgeschlagen. Server-Modus wird beendet.")
+            return
+    reporting_tools = _create_reporting_tools(token_tracker) if args.html_summary != 'false' else None
+
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_EPIC_WORKERS) as executor:
+            # Zeilen als Bytes lesen, damit das Byte-Muster _JIRA_KEY_RE direkt passt
+            for line in sys.stdin.buffer:
+                match = _JIRA_KEY_RE.search(line)
+                if match:
+                    process_business_epics([match.group(0).decode()], args, token_tracker,
+                                           scraper=scraper, reporting_tools=reporting_tools, executor=executor)
+    finally:
+        if reporting_tools:
+            reporting_tools[-1].close()
+        if scraper and scraper.login_handler:
+            scraper.login_handler.close()
+
 
 def main():
     """
@@ -195,20 +529,25 @@ def main():
     parser.add_argument('--issue', type=str, default=None, help='Spezifische Jira-Issue-ID')
     parser.add_argument('--file', type=str, default=None, help='Pfad zur TXT-Datei mit Business Epics')
     parser.add_argument('--translate', type=str.lower, choices=['true', 'false', 'check'], default='false', help="Übersetzt den HTML-Report ins Englische.")
-    parser.add_argument('--retry-failed', action='store_true', help='Führt nur den Retry für fehlgeschlagene Issues aus der Log-Datei aus.')
+    parser.add_argument('--retry-failed', action='store_true', help='Führt den Retry für fehlgeschlagene Issues aus der Log-Datei aus; ohne --issue/--file nur diesen, sonst im Anschluss an das Scraping mit derselben Session.')
+    parser.add_argument('--force-rebuild', action='store_true', help="Ignoriert gecachte Zusammenfassungen (entspricht '--html_summary true').")
+    parser.add_argument('--server', action='store_true', help='Bleibt aktiv und verarbeitet Epic-IDs zeilenweise von stdin.')
+    parser.add_argument('--pickle-cache', action='store_true', help='Legt gecachte Zusammenfassungen zusätzlich als Pickle-Datei ab und lädt sie im check-Modus bevorzugt.')
+    parser.add_argument('--export-json', action='store_true', help='Schreibt zusätzlich die Legacy-Datei <epic>_complete_summary.json.')
 
     args = parser.parse_args()
+    if args.force_rebuild:
+        args.html_summary = 'true'
 
-    stop_event = threading.Event()
-    keep_awake_thread = threading.Thread(target=prevent_screensaver, args=(stop_event,))
-    keep_awake_thread.daemon = True
-    keep_awake_thread.start()
+    # Verhindert auf macOS Ruhezustand und Bildschirmschoner, solange das Skript läuft
+    caffeinate = subprocess.Popen(['caffeinate', '-dimsu']) if sys.platform == 'darwin' else None
 
     try:
         token_tracker = TokenUsage(log_file_path=TOKEN_LOG_FILE)
 
         # +++ NEU: Logik zur Behandlung von --retry-failed +++
-        if args.retry_failed:
+        # Ohne Epic-Angabe nur Retry; mit --issue/--file folgt er dem Scraping
+        if args.retry_failed and not (args.issue or args.file):
             print("\n--- Modus: Nur fehlgeschlagene Issues erneut verarbeiten ---")
             business_value_system_prompt = load_prompt("business_value_prompt.yaml", "system_prompt")
             azure_extraction_client = AzureAIClient(system_prompt=business_value_system_prompt)
@@ -216,173 +555,23 @@ def main():
             # Nach dem Retry-Lauf wird das Skript beendet.
             return
 
+        # Server-Modus: Prozess bleibt aktiv und verarbeitet Epic-IDs von stdin,
+        # damit Batch-Treiber nicht pro Epic alle Module neu importieren müssen.
+        if args.server:
+            _run_server(args, token_tracker)
+            return
+
         business_epics = [args.issue] if args.issue else get_business_epics_from_file(args.file)
         if not business_epics:
             print("Keine Business Epics gefunden. Programm wird beendet.")
             return
 
-        if args.scraper != 'false':
-            print(f"\n--- Scraping-Modus gestartet (Mode: {args.scraper}) ---")
-            business_value_system_prompt = load_prompt("business_value_prompt.yaml", "system_prompt")
-            azure_extraction_client = AzureAIClient(system_prompt=business_value_system_prompt)
-
-            scraper = JiraScraper(
-                f"https://jira.telekom.de/browse/{business_epics[0]}", JIRA_EMAIL,
-                model=LLM_MODEL_BUSINESS_VALUE, token_tracker=token_tracker,
-                azure_client=azure_extraction_client, scrape_mode=args.scraper,
-                check_days=SCRAPER_CHECK_DAYS
-            )
-            for i, epic in enumerate(business_epics):
-                print(f"\n\n=============================================================\nVerarbeite Business Epic {i+1}/{len(business_epics)}: {epic}")
-                scraper.url = f"https://jira.telekom.de/browse/{epic}"
-                scraper.processed_issues = set()
-                scraper.run(skip_login=(i > 0))
-            if scraper.login_handler: scraper.login_handler.close()
-        else:
-            print("\n--- Scraping übersprungen (Mode: 'false') ---")
-
-        # +++ VEREINHEITLICHTE LOGIK FÜR ANALYSE UND REPORTING +++
-        if args.html_summary != 'false':
-            print("\n--- Analyse / Reporting gestartet ---")
-
-            # Initialisierung der benötigten Clients und Generatoren
-            azure_summary_client = AzureAIClient()
-            visualizer = JiraTreeVisualizer(format='png')
-            context_generator = JiraContextGenerator()
-            html_generator = EpicHtmlGenerator(model=LLM_MODEL_HTML_GENERATOR, token_tracker=token_tracker)
-            json_parser = LLMJsonParser()
-            analysis_runner = AnalysisRunner(ANALYZERS_TO_RUN)
-            json_summary_generator = JsonSummaryGenerator()
-            reporter = ConsoleReporter()
-
-
-            for epic in business_epics:
-                print(f"\n--- Starte Verarbeitung für {epic} ---")
-                complete_epic_data = None
-                complete_summary_path = os.path.join(JSON_SUMMARY_DIR, f"{epic}_complete_summary.json")
-
-                # Schritt 1: Prüfen, ob eine gecachte Datei verwendet werden soll ('check'-Modus)
-                if args.html_summary == 'check' and os.path.exists(complete_summary_path):
-                    logger.info(f"Lade vollständige Zusammenfassung aus Cache: {complete_summary_path}")
-                    try:
-                        with open(complete_summary_path, 'r', encoding='utf-8') as f:
-                            complete_epic_data = json.load(f)
-                    except (json.JSONDecodeError, IOError) as e:
-                        logger.info(f"Konnte Cache-Datei nicht lesen ({e}). Erstelle Zusammenfassung neu.")
-
-                # Schritt 2: Wenn keine Cache-Datei vorhanden oder '--html_summary true', alles neu generieren
-                if complete_epic_data is None:
-                    logger.info("Keine gültige Cache-Datei gefunden oder Neuerstellung erzwungen. Generiere alle Daten...")
-
-                    # 2a: Metrische Analysen durchführen
-                    data_provider = ProjectDataProvider(epic_id=epic, hierarchy_config=JIRA_TREE_FULL)
-                    if not data_provider.is_valid():
-                        logger.error(f"Fehler: Konnte keine gültigen Daten für Analyse von Epic '{epic}' laden. Verarbeitung wird übersprungen.")
-                        continue
-                    print(f"     - Erstelle Analyse für {epic}")
-                    analysis_results = analysis_runner.run_analyses(data_provider)
-                    reporter.create_backlog_plot(analysis_results.get("BacklogAnalyzer", {}), epic)
-
-                    # 2b: Inhaltliche Zusammenfassung per LLM erstellen
-                    logger.info(f"Erstelle vollständigen Baum für Visualisierung von {epic} mit JIRA_TREE_MANAGEMENT.")
-                    tree_generator_full = JiraTreeGenerator(allowed_types=JIRA_TREE_MANAGEMENT)
-                    issue_tree_for_visualization = tree_generator_full.build_issue_tree(epic)
-
-                    if issue_tree_for_visualization:
-                        visualizer.visualize(issue_tree_for_visualization, epic)
-                    else:
-                        logger.warning(f"Konnte keinen Baum für die Visualisierung von {epic} erstellen. Die Grafik wird im Report fehlen.")
-
-                    issue_tree_for_context = issue_tree_for_visualization
-
-                    if issue_tree_for_context and len(issue_tree_for_context) > MAX_JIRA_TREE_CONTEXT_SIZE:
-                        logger.info(f"Management-Baum für LLM-Kontext von {epic} ist mit {len(issue_tree_for_context)} Knoten zu groß (Max: {MAX_JIRA_TREE_CONTEXT_SIZE}). Reduziere auf LIGHT-Hierarchie.")
-                        tree_generator_light = JiraTreeGenerator(allowed_types=JIRA_TREE_MANAGEMENT_LIGHT)
-                        issue_tree_for_context = tree_generator_light.build_issue_tree(epic)
-
-                    if not issue_tree_for_context:
-                        logger.warning(f"Konnte keinen gültigen Baum für die LLM-Kontext-Generierung von {epic} erstellen. Überspringe Summary-Generierung.")
-                        continue
-
-                    json_context = context_generator.generate_context(issue_tree_for_context, epic)
-                    summary_prompt_template = load_prompt("summary_prompt.yaml", "user_prompt_template")
-                    summary_prompt = summary_prompt_template.format(json_context=json_context)
-                    print(f"     - Erstelle Summary für {epic}")
-                    response_data = azure_summary_client.completion(
-                        model_name=LLM_MODEL_SUMMARY,
-                        user_prompt=summary_prompt,
-                        max_tokens=20000,
-                        response_format={"type": "json_object"}
-                    )
-
-                    if token_tracker and "usage" in response_data:
-                        usage = response_data["usage"]
-                        token_tracker.log_usage(model=LLM_MODEL_SUMMARY, input_tokens=usage.prompt_tokens, output_tokens=usage.completion_tokens, total_tokens=usage.total_tokens, task_name=f"summary_generation")
-
-                    content_summary = json_parser.extract_and_parse_json(response_data["text"])
-                    epic_status = data_provider.issue_details.get(epic, {}).get('status', 'Unbekannt')
-                    target_start_status = data_provider.issue_details.get(epic, {}).get('target_start', 'Unbekannt')
-                    target_end_status = data_provider.issue_details.get(epic, {}).get('target_end', 'Unbekannt')
-                    fix_version_status = data_provider.issue_details.get(epic, {}).get('fix_versions', 'Unbekannt')
-                    ordered_content_summary = {"epicId": content_summary.get("epicId"), "title": content_summary.get("title"), "status": epic_status, "target_start": target_start_status, "target_end": target_end_status, "fix_versions": fix_version_status}
-                    ordered_content_summary.update({k: v for k, v in content_summary.items() if k not in ordered_content_summary})
-                    content_summary = ordered_content_summary
-
-                    # 2c: Alle Daten fusionieren und als eine JSON-Datei speichern
-                    complete_epic_data = json_summary_generator.generate_and_save_complete_summary(analysis_results=analysis_results, content_summary=content_summary, epic_id=epic)
-
-                # Schritt 3: HTML-Datei aus den vollständigen Daten (neu oder aus Cache) erstellen
-                if complete_epic_data:
-                    print(f"     - Erstelle HTML-File für {epic}")
-                    logger.info(f"Erstelle HTML-Report für {epic}...")
-                    html_file = os.path.join(HTML_REPORTS_DIR, f"{epic}_summary.html")
-                    html_generator.generate_epic_html(complete_epic_data, epic, html_file)
-                else:
-                    logger.error(f"Konnte keine vollständigen Daten für die HTML-Erstellung von {epic} erzeugen.")
-                
-                if args.translate != 'false':
-                    # Eigener AI Client für den Übersetzer, da der System-Prompt spezialisiert ist.
-                    # Der HtmlTranslator setzt den korrekten System-Prompt selbst.
-                    azure_translator_client = AzureAIClient()
-                    html_translator = HtmlTranslator(
-                        ai_client=azure_translator_client,
-                        token_tracker=token_tracker,
-                        model_name=LLM_MODEL_TRANSLATOR
-                    )
-
-                    german_html_path = os.path.join(HTML_REPORTS_DIR, f"{epic}_summary.html")
-                    english_html_path = os.path.join(HTML_REPORTS_DIR, f"{epic}_summary_englisch.html")
-
-                    # WICHTIG: Prüfen, ob die deutsche Quelldatei existiert.
-                    if not os.path.exists(german_html_path):
-                        logger.warning(f"Übersetzung für {epic} übersprungen, da die deutsche HTML-Datei nicht existiert.")
-                    else:
-                        run_translation = False
-                        if args.translate == 'true':
-                            run_translation = True
-                            logger.info(f"Übersetzung für {epic} wird erzwungen ('--translate true').")
-
-                        elif args.translate == 'check':
-                            if not os.path.exists(english_html_path):
-                                run_translation = True
-                                logger.info(f"Englische Version für {epic} existiert nicht. Starte Übersetzung ('--translate check').")
-                            else:
-                                logger.info(f"Englische Version für {epic} existiert bereits. Übersetzung wird übersprungen.")
-
-                        if run_translation:
-                            try:
-                                print(f"     - Übersetze HTML-File für {epic}")
-                                html_translator.translate_file(epic)
-                            except Exception as e:
-                                logger.error(f"Fehler bei der Übersetzung von {epic}: {e}")
-
-        else:
-            print("\n--- Analyse und HTML-Summary übersprungen ---")
+        process_business_epics(business_epics, args, token_tracker)
 
     finally:
-        logger.info("Hauptprogramm wird beendet. Stoppe den Keep-Awake-Thread...")
-        stop_event.set()
-        keep_awake_thread.join(timeout=2)
+        logger.info("Hauptprogramm wird beendet.")
+        if caffeinate:
+            caffeinate.terminate()
 
 
 if __name__ == "__main__":
@@ -18,8 +18,8 @@ JSON-Dateien. Für jedes Epic führt es die folgenden Schritte aus:
     ('data/comparison_results.jsonl') gespeichert.
 """
 import os
-import json
 import sys
+import orjson
 import instructor  # ### HINZUGEFÜGT ###
 from typing import Dict, Any
 
@@ -29,16 +29,18 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 # Importieren der notwendigen Module und Klassen aus Ihrem Projekt
-from utils.business_impact_api import process_description
+from utils.business_impact_api import process_description_json
 from utils.azure_ai_client import AzureAIClient
 from utils.token_usage_class import TokenUsage
 from utils.prompt_loader import load_prompt_template
+from utils.rate_limiter import get_limiter, estimate_tokens
 from utils.config import (
     JIRA_ISSUES_DIR,
     LLM_MODEL_BUSINESS_VALUE,
     LLM_MODEL_SUMMARY,
     TOKEN_LOG_FILE,
-    DATA_DIR
+    DATA_DIR,
+    BUSINESS_EPIC_KEY_PREFIX
 )
 
 def run_comparison_workflow():
@@ -57,8 +59,11 @@ def run_comparison_workflow():
     comparison_prompt_template = load_prompt_template("comparison_prompt.yaml", "comparison_prompt_template")
 
     try:
-        all_files = [f for f in os.listdir(JIRA_ISSUES_DIR) if f.endswith('.json')]
-        print(f"Gefunden: {len(all_files)} JSON-Dateien im Verzeichnis.")
+        # Business Epics am Dateinamen vorfiltern, statt jede Issue-Datei zu parsen
+        with os.scandir(JIRA_ISSUES_DIR) as entries:
+            all_files = [e.name for e in entries
+                         if e.name.startswith(BUSINESS_EPIC_KEY_PREFIX) and e.name.endswith('.json')]
+        print(f"Gefunden: {len(all_files)} Business-Epic-Dateien im Verzeichnis.")
     except FileNotFoundError:
         print(f"FEHLER: Das Verzeichnis '{JIRA_ISSUES_DIR}' wurde nicht gefunden.")
         return
@@ -77,8 +82,8 @@ def run_comparison_workflow():
 
         try:
             filepath = os.path.join(JIRA_ISSUES_DIR, filename)
-            with open(filepath, 'r', encoding='utf-8') as f:
-                issue_data = json.load(f)
+            with open(filepath, 'rb') as f:
+                issue_data = orjson.loads(f.read())
 
             if issue_data.get("issue_type") != "Business Epic":
                 #print(f"Info: {epic_key} ist kein Business Epic (Typ: {issue_data.get('issue_type')}). Wird übersprungen.")
@@ -95,19 +100,19 @@ def run_comparison_workflow():
 
             # --- 3. Generiere neue Daten mit der business_impact_api (jetzt mit Pydantic) ---
             print("Generiere neue Description und neuen Business Value...")
-            processed_data = process_description(
+            # Der Business Value kommt bereits als JSON-Bytes (pydantic-core) zurück
+            new_description, new_business_value_json = process_description_json(
                 description_text=original_description,
                 model=LLM_MODEL_BUSINESS_VALUE,
                 token_tracker=token_tracker,
                 azure_client=azure_client
             )
-            new_description = processed_data["description"]
-            new_business_value = processed_data["business_value"]
 
             # --- 4. Vergleiche den alten und neuen Business Value ---
             print("Vergleiche alten und neuen Business Value mit der KI...")
-            old_bv_str = json.dumps(old_business_value, indent=2, ensure_ascii=False)
-            new_bv_str = json.dumps(new_business_value, indent=2, ensure_ascii=False)
+            # Kompakt serialisiert: Einrückungen kosten nur Prompt-Tokens
+            old_bv_str = orjson.dumps(old_business_value).decode()
+            new_bv_str = new_business_value_json.decode()
 
             comparison_prompt = comparison_prompt_template.format(
                 description=original_description,
@@ -117,19 +122,21 @@ def run_comparison_workflow():
 
             # Hier könnten wir den Vergleichs-Prompt ebenfalls auf Pydantic umstellen,
             # aber zur Vereinfachung belassen wir es vorerst bei der bisherigen Methode.
-            comparison_response = azure_client.chat.completions.create(
+            comparison_response = get_limiter(LLM_MODEL_SUMMARY).call(
+                azure_client.chat.completions.create,
+                estimate_tokens(comparison_prompt),
                 model=LLM_MODEL_SUMMARY,
                 messages=[{"role": "user", "content": comparison_prompt}],
                 response_format={"type": "json_object"}
             )
 
-            ai_assessment = json.loads(comparison_response.choices[0].message.content)
+            ai_assessment = orjson.loads(comparison_response.choices[0].message.content)
 
             # --- 5. Speichere die Ergebnisse für dieses Epic ---
             result_for_epic = {
                 "epic_key": epic_key,
                 "new_description": new_description,
-                "new_business_value": new_business_value,
+                "new_business_value": orjson.Fragment(new_business_value_json),
                 "ai_assessment": ai_assessment
             }
             all_results.append(result_for_epic)
@@ -143,9 +150,8 @@ def run_comparison_workflow():
     output_filename = os.path.join(DATA_DIR, "comparison_results.jsonl")
     print(f"\nSpeichere alle {len(all_results)} Ergebnisse in '{output_filename}'...")
     try:
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            for entry in all_results:
-                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        with open(output_filename, 'wb') as f:
+            f.write(b''.join(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE) for entry in all_results))
         print("Speichern erfolgreich.")
     except Exception as e:
         print(f"FEHLER beim Speichern der Ergebnisse: {e}")
@@ -14,17 +14,24 @@ ist klar strukturiert und hebt die folgenden Punkte hervor:
 - Die neue, vom LLM bereinigte Beschreibung.
 - Der neue, vom LLM extrahierte Business Value im formatierten JSON-Format.
 """
-import json
 import os
+import sys
+import orjson
 import textwrap
 
 # --- KONFIGURATION ---
 # Passen Sie diesen Pfad an, falls Ihre Ergebnisdatei woanders liegt.
 # Der Pfad geht davon aus, dass das Skript im 'src'-Ordner liegt und die
 # Daten in einem parallelen 'data'-Ordner.
-INPUT_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'comparison_results.jsonl')
+INPUT_FILE = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'comparison_results.jsonl'))
 # --- ENDE KONFIGURATION ---
 
+# Einmalig erzeugte TextWrapper statt eines neuen Objekts pro fill()-Aufruf
+_WRAP75 = textwrap.TextWrapper(width=75 + len('   > '), initial_indent='   > ', subsequent_indent='   > ')
+_WRAP80 = textwrap.TextWrapper(width=80)
+EQ = '=' * 80
+DASH = '-' * 80
+
 def print_epic_assessment(data: dict):
     """Gibt die formatierte Auswertung für ein einzelnes Epic aus."""
 
@@ -33,51 +40,50 @@ def print_epic_assessment(data: dict):
     new_description = data.get("new_description", "Keine Beschreibung vorhanden.")
     new_business_value = data.get("new_business_value", {})
 
+    # Der gesamte Block eines Epics wird gesammelt und mit einem einzigen write() ausgegeben
+    out = []
+
     # --- Header mit Epic Key ---
-    print(f"\n{'='*80}")
-    print(f" E P I C :   {epic_key}")
-    print(f"{'='*80}")
+    out.append(f"\n{EQ}\n E P I C :   {epic_key}\n{EQ}\n")
 
     # --- KI-Bewertung ---
     quality = ai_assessment.get('quality_assessment', 'N/A')
     summary = ai_assessment.get('assessment_summary', 'Keine Zusammenfassung.')
 
-    print(f"\n📋 QUALITÄTSBEWERTUNG: {quality}")
-    print("\n   Zusammenfassung:")
+    out.append(f"\n📋 QUALITÄTSBEWERTUNG: {quality}\n")
+    out.append("\n   Zusammenfassung:\n")
     # Textwrap sorgt für saubere Umbrüche bei langen Sätzen
-    print(textwrap.indent(textwrap.fill(summary, width=75), '   > '))
+    out.append(_WRAP75.fill(summary) + "\n")
 
     # --- Informationsgewinn ---
-    print("\n[+] INFORMATIONSGEWINN:")
+    out.append("\n[+] INFORMATIONSGEWINN:\n")
     gained_info = ai_assessment.get('information_gained', [])
     if gained_info:
         for item in gained_info:
-            print(textwrap.indent(f"- {item}", '    '))
+            out.append(f"    - {item}\n")
     else:
-        print("    - Keiner")
+        out.append("    - Keiner\n")
 
     # --- Informationsverlust ---
-    print("\n[-] INFORMATIONSVERLUST:")
+    out.append("\n[-] INFORMATIONSVERLUST:\n")
     lost_info = ai_assessment.get('information_lost', [])
     if lost_info:
         for item in lost_info:
-            print(textwrap.indent(f"- {item}", '    '))
+            out.append(f"    - {item}\n")
     else:
-        print("    - Keiner")
+        out.append("    - Keiner\n")
 
     # --- Neue, bereinigte Beschreibung ---
-    print(f"\n{'-'*80}")
-    print("📄 NEUE, BEREINIGTE BESCHREIBUNG:")
-    print(f"{'-'*80}")
-    print(textwrap.fill(new_description, width=80))
+    out.append(f"\n{DASH}\n📄 NEUE, BEREINIGTE BESCHREIBUNG:\n{DASH}\n")
+    out.append(_WRAP80.fill(new_description) + "\n")
 
     # --- Neuer, extrahierter Business Value ---
-    print(f"\n{'-'*80}")
-    print("💰 NEUER BUSINESS VALUE (JSON):")
-    print(f"{'-'*80}")
+    out.append(f"\n{DASH}\n💰 NEUER BUSINESS VALUE (JSON):\n{DASH}\n")
     # Gib das JSON-Objekt formatiert aus
-    print(json.dumps(new_business_value, indent=2, ensure_ascii=False))
-    print("\n")
+    out.append(orjson.dumps(new_business_value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode())
+    out.append("\n\n\n")
+
+    sys.stdout.write(''.join(out))
 
 
 def main():
@@ -88,14 +94,20 @@ def main():
 
     print(f"Lese Ergebnisse aus '{INPUT_FILE}'...")
 
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        for line in f:
+    # Binär lesen: orjson parst die Bytes direkt, ohne vorheriges Dekodieren
+    with open(INPUT_FILE, 'rb', buffering=65536) as f:
+        for i, line in enumerate(f):
+            if i == 0:
+                line = line.lstrip(b'\xef\xbb\xbf')  # evtl. vorhandene UTF-8-BOM entfernen
+            if line == b'\n' or not line.strip():  # Leerzeilen (z.B. am Dateiende) nicht erst parsen
+                continue
             try:
                 # Jede Zeile ist ein separates JSON-Objekt
-                data = json.loads(line)
+                data = orjson.loads(line)
                 print_epic_assessment(data)
-            except json.JSONDecodeError:
-                print(f"WARNUNG: Konnte eine Zeile nicht als JSON parsen: {line.strip()}")
+            except orjson.JSONDecodeError:
+                print(f"WARNUNG: Konnte eine Zeile nicht als JSON parsen: {line.strip().decode('utf-8', errors='replace')}")
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
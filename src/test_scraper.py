@@ -1,4 +1,14 @@
+import os
+import argparse
+import orjson
+from pathlib import Path
+
 from utils.jira_scraper_api import JiraScraper
+from utils.config import JIRA_ISSUES_DIR
+
+parser = argparse.ArgumentParser(description='Smoke-Test für den API-basierten JiraScraper')
+parser.add_argument('--dump-epics', action='store_true', help='Liest die JSON-Dateien der verarbeiteten Issues und gibt deren Typ aus.')
+args = parser.parse_args()
 
 issue_key = "SDN-27638"
 url = f"https://jira.telekom.de/browse/{issue_key}"
@@ -6,8 +16,14 @@ url = f"https://jira.telekom.de/browse/{issue_key}"
 scraper = JiraScraper(url, email="", scrape_mode="check", check_days=1)
 if scraper.login():
     scraper.run()
-    print(f"\nProcessed {len(scraper.processed_issues)} issues:")
-    for k in list(scraper.processed_issues)[:10]:
-        print(" -", k)
+    print(f"\nProcessed {len(scraper.processed_issues)} issues.")
+    if args.dump_epics:
+        # Verzeichnis einmal auflisten statt pro Issue ein exists()-Check
+        with os.scandir(JIRA_ISSUES_DIR) as entries:
+            present = {e.name[:-5] for e in entries if e.name.endswith('.json')}
+        for k in sorted(scraper.processed_issues & present):
+            data = orjson.loads(Path(JIRA_ISSUES_DIR, f"{k}.json").read_bytes())
+            issue_type = data.get("issuetype") or ""
+            print(" -", k, f"({issue_type})" if issue_type else "")
 else:
     print("Login failed")
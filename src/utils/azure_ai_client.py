@@ -12,16 +12,52 @@ of the 'openai' library (v1.0+) and does not require third-party libraries like
 """
 
 import os
-import base64
-from typing import Dict, Optional, Any, List
+import mmap
+import binascii
+import functools
+import threading
+from typing import Dict, Optional, Any, List, TYPE_CHECKING
 
 # The official OpenAI library for interacting with Azure OpenAI
-from openai import AzureOpenAI
+import httpx
+from openai import AzureOpenAI, AsyncAzureOpenAI
 
-# Specific clients for Azure AI Foundation Models
-from azure.ai.inference import ChatCompletionsClient
-from azure.ai.inference.models import SystemMessage, UserMessage
-from azure.core.credentials import AzureKeyCredential
+# The Azure AI Foundation SDK is imported lazily on first use; callers that
+# only talk to Azure OpenAI never pay its import cost.
+if TYPE_CHECKING:
+    from azure.ai.inference import ChatCompletionsClient
+
+from utils.rate_limiter import get_limiter, estimate_tokens
+from utils import llm_cache
+
+
+# One pooled HTTP client shared by all sync AzureOpenAI instances in the process,
+# so TLS sessions are kept alive across completions and client instances.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_shared_http_client: Optional[httpx.Client] = None
+_shared_http_client_lock = threading.Lock()
+
+
+def _get_shared_http_client() -> httpx.Client:
+    """Returns the process-wide pooled httpx.Client, creating it on first use."""
+    global _shared_http_client
+    with _shared_http_client_lock:
+        if _shared_http_client is None:
+            _shared_http_client = httpx.Client(limits=_HTTP_LIMITS, timeout=60.0)
+        return _shared_http_client
+
+
+@functools.lru_cache(maxsize=32)
+def _image_data_url_cached(image_path: str, mtime_ns: int, size: int) -> str:
+    """
+    Reads and base64-encodes an image into a data URL. Keyed on mtime and size
+    so that a changed file on the same path is re-encoded. The file is mapped
+    and encoded directly with binascii, avoiding an intermediate bytes copy.
+    """
+    if size == 0:
+        return "data:image/jpeg;base64,"
+    with open(image_path, "rb") as image_file, mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return "data:image/jpeg;base64," + binascii.b2a_base64(mm, newline=False).decode("ascii")
 
 
 class AzureAIClient:
@@ -32,10 +68,15 @@ class AzureAIClient:
     specified model name. It handles specific model capabilities, such as
     multimodal input for OpenAI models and JSON formatting for foundation models.
     """
-    # Lists of supported models, categorized by the backend service
-    AZURE_OPENAI_MODELS = ["gpt-4.1", "gpt-4.1-mini", "gpt-4o", "o3-mini", "o4-mini"]
-    AZURE_AI_FOUNDATION_MODELS = ["DeepSeek-V3-0324", "DeepSeek-R1-0528", "Llama-3.3-70B-Instruct", "Llama-4-Maverick-17B-128E-Instruct-FP8", "mistral-medium-2505", "Phi-4"]
-    OPENAI_REASONING_MODELS = ["o3-mini", "o4-mini"]
+    # Supported models, categorized by the backend service. The ordered tuples
+    # are kept for display; dispatch uses the frozensets for O(1) lookups.
+    _OPENAI_MODELS_ORDERED = ("gpt-4.1", "gpt-4.1-mini", "gpt-4o", "o3-mini", "o4-mini")
+    _FOUNDATION_MODELS_ORDERED = ("DeepSeek-V3-0324", "DeepSeek-R1-0528", "Llama-3.3-70B-Instruct", "Llama-4-Maverick-17B-128E-Instruct-FP8", "mistral-medium-2505", "Phi-4")
+    _ALL_MODELS_ORDERED = _OPENAI_MODELS_ORDERED + _FOUNDATION_MODELS_ORDERED
+    AZURE_OPENAI_MODELS = frozenset(_OPENAI_MODELS_ORDERED)
+    AZURE_AI_FOUNDATION_MODELS = frozenset(_FOUNDATION_MODELS_ORDERED)
+    _REASONING_MODEL_PREFIXES = ("o3-mini", "o4-mini")
+    OPENAI_REASONING_MODELS = frozenset(_REASONING_MODEL_PREFIXES)
 
     def __init__(self, system_prompt: str = "You are a helpful assistant."):
         """
@@ -47,7 +88,8 @@ class AzureAIClient:
         self.system_prompt = system_prompt
         # Client instances are lazily initialized on first use
         self.openai_client: Optional[AzureOpenAI] = None
-        self.foundation_client: Optional[ChatCompletionsClient] = None
+        self.foundation_client: Optional["ChatCompletionsClient"] = None
+        self.async_openai_client: Optional[AsyncAzureOpenAI] = None
 
         # Immediately initialize the primary OpenAI client upon creation.
         self._initialize_openai_client()
@@ -61,8 +103,8 @@ class AzureAIClient:
                                   supported model names.
         """
         return {
-            "Azure OpenAI (multimodal)": self.AZURE_OPENAI_MODELS,
-            "Azure AI Foundation (text-only)": self.AZURE_AI_FOUNDATION_MODELS
+            "Azure OpenAI (multimodal)": list(self._OPENAI_MODELS_ORDERED),
+            "Azure AI Foundation (text-only)": list(self._FOUNDATION_MODELS_ORDERED)
         }
 
     def _initialize_openai_client(self):
@@ -72,12 +114,38 @@ class AzureAIClient:
                 api_key=os.environ.get("AZURE_OPENAI_API_KEY"),
                 api_version=os.environ.get("AZURE_OPENAI_API_VERSION"),
                 azure_endpoint=os.environ.get("AZURE_OPENAI_ENDPOINT"),
-                timeout=60.0
+                timeout=60.0,
+                http_client=_get_shared_http_client()
             )
 
+    def _initialize_async_openai_client(self) -> AsyncAzureOpenAI:
+        """
+        Initializes the async Azure OpenAI client (used for concurrent batches) on first use.
+
+        Its pooled httpx.AsyncClient is bound to the running event loop, so callers
+        must release it with aclose() before that loop ends.
+        """
+        if self.async_openai_client is None:
+            self.async_openai_client = AsyncAzureOpenAI(
+                api_key=os.environ.get("AZURE_OPENAI_API_KEY"),
+                api_version=os.environ.get("AZURE_OPENAI_API_VERSION"),
+                azure_endpoint=os.environ.get("AZURE_OPENAI_ENDPOINT"),
+                timeout=60.0,
+                http_client=httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=60.0)
+            )
+        return self.async_openai_client
+
+    async def aclose(self):
+        """Closes the async client and its connection pool."""
+        if self.async_openai_client is not None:
+            await self.async_openai_client.close()
+            self.async_openai_client = None
+
     def _initialize_foundation_client(self):
         """Initializes the Azure AI Foundation client if it hasn't been already."""
         if self.foundation_client is None:
+            from azure.ai.inference import ChatCompletionsClient
+            from azure.core.credentials import AzureKeyCredential
             self.foundation_client = ChatCompletionsClient(
                 endpoint=os.environ.get("AZURE_AIFOUNDRY_ENDPOINT"),
                 credential=AzureKeyCredential(os.environ.get("AZURE_AIFOUNDRY_API_KEY")),
@@ -85,20 +153,21 @@ class AzureAIClient:
 
     def _encode_image(self, image_path: str) -> str:
         """
-        Reads an image file and encodes it into a base64 string.
+        Returns the image as a base64 data URL, cached per path and file version.
 
         Args:
             image_path (str): The local file path to the image.
 
         Returns:
-            str: The base64-encoded string representation of the image.
+            str: The 'data:image/jpeg;base64,...' URL of the image.
         """
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
+        st = os.stat(image_path)
+        return _image_data_url_cached(image_path, st.st_mtime_ns, st.st_size)
 
     def _is_reasoning_model(self, model_name: str) -> bool:
         """
-        Checks if the model is designated as a high-reasoning model.
+        Checks if the model is designated as a high-reasoning model
+        (exact name or a dated variant such as 'o3-mini-2025-01-31').
 
         Args:
             model_name (str): The name of the model to check.
@@ -106,7 +175,7 @@ class AzureAIClient:
         Returns:
             bool: True if the model is in the reasoning list, False otherwise.
         """
-        return any(model_name.startswith(rm) for rm in self.OPENAI_REASONING_MODELS)
+        return model_name in self.OPENAI_REASONING_MODELS or model_name.startswith(self._REASONING_MODEL_PREFIXES)
 
     def completion(self,
                 model_name: str,
@@ -114,7 +183,8 @@ class AzureAIClient:
                 image_path: Optional[str] = None,
                 temperature: float = 0,
                 max_tokens: int = 2048,
-                response_format: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+                response_format: Optional[Dict[str, str]] = None,
+                use_cache: bool = False) -> Dict[str, Any]:
         """
         Generates a standard completion, routing to the correct API.
 
@@ -130,6 +200,9 @@ class AzureAIClient:
             max_tokens (int): The maximum number of tokens to generate.
             response_format (Optional[Dict[str, str]]): A dictionary specifying
                 the response format (e.g., `{"type": "json_object"}`).
+            use_cache (bool): Serve/persist the response from the on-disk LLM
+                cache. Only honored for deterministic calls (temperature 0);
+                cache hits carry no 'usage' entry.
 
         Raises:
             ValueError: If the model name is unknown or if an image is provided
@@ -139,26 +212,41 @@ class AzureAIClient:
             Dict[str, Any]: A dictionary containing the model's response text
                 and token usage statistics.
         """
-        if model_name in self.AZURE_OPENAI_MODELS or self._is_reasoning_model(model_name):
-            return self._generate_openai(model_name, user_prompt, image_path, temperature, max_tokens, response_format)
+        cache_key = None
+        if use_cache and temperature == 0 and not image_path:
+            cache_key = llm_cache.make_key(model=model_name, system=self.system_prompt, prompt=user_prompt,
+                                           format=response_format, max_tokens=max_tokens)
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        response = self._route_completion(model_name, user_prompt, image_path, temperature, max_tokens, response_format)
+        if cache_key:
+            llm_cache.set(cache_key, {"text": response["text"]})
+        return response
+
+    def _route_completion(self, model_name, user_prompt, image_path, temperature, max_tokens, response_format):
+        """Dispatches a completion to the backend that serves the given model."""
+        is_reasoning = self._is_reasoning_model(model_name)
+        if is_reasoning or model_name in self.AZURE_OPENAI_MODELS:
+            return self._generate_openai(model_name, user_prompt, image_path, temperature, max_tokens, response_format, is_reasoning)
         elif model_name in self.AZURE_AI_FOUNDATION_MODELS:
             if image_path:
                 raise ValueError(f"Model {model_name} does not support images.")
             return self._generate_foundation(model_name, user_prompt, temperature, max_tokens, response_format)
         else:
-            available_models = self.AZURE_OPENAI_MODELS + self.AZURE_AI_FOUNDATION_MODELS
-            raise ValueError(f"Unknown model: {model_name}. Available models: {available_models}")
+            raise ValueError(f"Unknown model: {model_name}. Available models: {list(self._ALL_MODELS_ORDERED)}")
 
 
-    def _generate_openai(self, model_name, user_prompt, image_path=None, temperature=0, max_tokens=2048, response_format=None):
+    def _generate_openai(self, model_name, user_prompt, image_path=None, temperature=0, max_tokens=2048, response_format=None, is_reasoning=None):
         """
         Generates a completion using the Azure OpenAI service.
         Handles both text-only and multimodal (text + image) inputs.
         """
         messages = [{"role": "system", "content": self.system_prompt}]
         if image_path:
-            base64_image = self._encode_image(image_path)
-            messages.append({"role": "user", "content": [{"type": "text", "text": user_prompt}, {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{base64_image}", "detail": "high"}}]})
+            image_url = self._encode_image(image_path)
+            messages.append({"role": "user", "content": [{"type": "text", "text": user_prompt}, {"type": "image_url", "image_url": {"url": image_url, "detail": "high"}}]})
         else:
             messages.append({"role": "user", "content": user_prompt})
 
@@ -168,7 +256,9 @@ class AzureAIClient:
             kwargs["response_format"] = response_format
 
         # Note: 'max_tokens' and 'temperature' are handled differently by different model families
-        if self._is_reasoning_model(model_name):
+        if is_reasoning is None:
+            is_reasoning = self._is_reasoning_model(model_name)
+        if is_reasoning:
             kwargs["max_completion_tokens"] = max_tokens
             # Do not add 'temperature' as it is not supported by these models
         else:
@@ -176,7 +266,9 @@ class AzureAIClient:
             # Only add 'temperature' for models that support it
             kwargs["temperature"] = temperature
 
-        response = self.openai_client.chat.completions.create(**kwargs)
+        # Preemptive per-model RPM/TPM throttling with 429 backoff as fallback
+        estimated = estimate_tokens(self.system_prompt + user_prompt)
+        response = get_limiter(model_name).call(self.openai_client.chat.completions.create, estimated, **kwargs)
         return {
             "text": response.choices[0].message.content,
             "usage": response.usage
@@ -188,6 +280,7 @@ class AzureAIClient:
         Generates a completion using the Azure AI Foundation Models service.
         Handles text-only inputs and enforces JSON output when requested.
         """
+        from azure.ai.inference.models import SystemMessage, UserMessage
         self._initialize_foundation_client()
         system_prompt_text = self.system_prompt
         if response_format and response_format.get("type") == "json_object":
@@ -200,7 +293,8 @@ class AzureAIClient:
         if response_format and response_format.get("type") == "json_object":
             kwargs["response_format"] = {"type": response_format.get("type")}
 
-        response = self.foundation_client.chat.completions.create(**kwargs)
+        estimated = estimate_tokens(system_prompt_text + user_prompt)
+        response = get_limiter(model_name).call(self.foundation_client.chat.completions.create, estimated, **kwargs)
         return {
             "text": response.choices[0].message.content,
             "usage": response.usage
@@ -20,6 +20,11 @@ Key Components
   is the top-level model the AI is instructed to populate.
 - **process_description()**: The primary function that takes raw text, communicates
   with the AI, and returns the separated, structured data.
+- **process_description_json()**: Same as process_description(), but returns the
+  business value as pre-serialized JSON bytes for writers that emit JSON.
+- **aprocess_description()** / **process_descriptions_concurrently()**: Async
+  variant and batch helper that run many descriptions concurrently, capped by a
+  semaphore to respect Azure rate limits.
 - **get_empty_business_value_dict()**: A helper function to generate a default
   empty result, used when input is empty or in case of an error.
 
@@ -33,14 +38,17 @@ The data model is defined by the following Pydantic classes:
 """
 
 import os
-import json
+import copy
+import asyncio
+import orjson
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, Tuple
 
 from utils.azure_ai_client import AzureAIClient
 from utils.prompt_loader import load_prompt_template
-from dotenv import load_dotenv, find_dotenv
-_ = load_dotenv(find_dotenv())
+from utils.rate_limiter import get_limiter, estimate_tokens
+from utils.env import ensure_env
+ensure_env()
 
 class BusinessImpact(BaseModel):
     """Data model for the financial and operational impact of a task."""
@@ -75,23 +83,106 @@ class AIResponse(BaseModel):
     business_value: BusinessValue
 
 
+# Leere Business-Value-Struktur, einmalig beim Import erzeugt
+# (Empty business value structure, built once at import time).
+# model_construct() überspringt die Validierung; sicher, da alle Werte feste,
+# schema-konforme Literale sind und jedes Feld explizit gesetzt wird.
+_EMPTY_BV = BusinessValue.model_construct(
+    business_impact=BusinessImpact.model_construct(scale=0, revenue="", cost_saving="", risk_loss="", justification=""),
+    strategic_enablement=StrategicEnablement.model_construct(scale=0, risk_minimization="", strat_enablement="", justification=""),
+    time_criticality=TimeCriticality.model_construct(scale=0, time="", justification="")
+).model_dump()
+
+
 def get_empty_business_value_dict() -> dict:
     """
     Returns a default empty business value structure as a dictionary.
 
-    This is used as a fallback for empty inputs or processing errors.
+    This is used as a fallback for empty inputs or processing errors. The
+    structure is built once at import; callers get an independent copy.
 
     Returns:
         dict: A dictionary representing an empty BusinessValue object.
     """
-    # Erstellt eine leere Instanz des Pydantic-Modells und wandelt sie in ein dict um
-    # (Creates an empty instance of the Pydantic model and converts it to a dict)
-    empty_bv = BusinessValue(
-        business_impact=BusinessImpact(scale=0),
-        strategic_enablement=StrategicEnablement(scale=0),
-        time_criticality=TimeCriticality(scale=0)
+    return copy.deepcopy(_EMPTY_BV)
+
+_EMPTY_BV_JSON = orjson.dumps(_EMPTY_BV)
+
+BUSINESS_IMPACT_SYSTEM_PROMPT = "Extract the event information from the user's description and separate it from the core text."
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+def _build_messages(description_text: str) -> list:
+    """Builds the chat messages for the business impact extraction."""
+    prompt_template = load_prompt_template("business_impact_prompt.yaml", "user_prompt_template")
+    prompt = prompt_template.format(description_text=description_text)
+    return [
+        {"role": "system", "content": BUSINESS_IMPACT_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _estimate_message_tokens(messages: list) -> int:
+    """Rough prompt-token estimate used to reserve rate-limiter budget."""
+    return estimate_tokens(messages[0]["content"] + messages[1]["content"])
+
+
+def _request_completion(messages: list, model: str, azure_client: AzureAIClient):
+    """
+    Runs the synchronous structured-output call against Azure OpenAI.
+
+    The call goes through the shared per-model rate limiter, so it counts
+    against the same RPM/TPM budget as the async variant and backs off on 429s.
+    """
+    # NEUER, NATIVER AUFRUF mit .parse()
+    return get_limiter(model).call(
+        azure_client.openai_client.beta.chat.completions.parse,
+        _estimate_message_tokens(messages),
+        model=model,
+        messages=messages,
+        response_format=AIResponse, # Direkt die Pydantic-Klasse übergeben
     )
-    return empty_bv.model_dump()
+
+
+def _parse_response(completion, model: str, token_tracker) -> AIResponse:
+    """Logs token usage and returns the parsed AIResponse of a completion."""
+    # Das Ergebnis ist bereits ein Pydantic-Objekt
+    ai_response_object = completion.choices[0].message.parsed
+
+    # Token-Erfassung funktioniert weiterhin
+    if token_tracker and hasattr(completion, 'usage') and completion.usage:
+         usage = completion.usage
+         token_tracker.log_usage(
+            model=model,
+            input_tokens=usage.prompt_tokens,
+            output_tokens=usage.completion_tokens,
+            total_tokens=usage.total_tokens,
+            task_name="business_impact",
+        )
+    return ai_response_object
+
+
+def _build_result(completion, model: str, token_tracker) -> dict:
+    """Converts the parsed completion into the result dict."""
+    ai_response_object = _parse_response(completion, model, token_tracker)
+    return {
+        "description": ai_response_object.cleaned_description.strip(),
+        "business_value": ai_response_object.business_value.model_dump(),
+    }
+
+
+def _report_fallback(error: Exception):
+    """Reports a failed extraction; shared by the dict and the JSON variant."""
+    print(f"Error creating Pydantic object from AI response: {error}. Returning original description and empty business value.")
+
+
+def _fallback_result(description_text: str, error: Exception) -> dict:
+    _report_fallback(error)
+    return {
+        "description": description_text.strip(),
+        "business_value": get_empty_business_value_dict(),
+    }
+
 
 def process_description(description_text: str, model: str, token_tracker, azure_client: AzureAIClient) -> dict:
     """
@@ -100,43 +191,82 @@ def process_description(description_text: str, model: str, token_tracker, azure_
     if not description_text:
         return {"description": "", "business_value": get_empty_business_value_dict()}
 
-    prompt_template = load_prompt_template("business_impact_prompt.yaml", "user_prompt_template")
-    prompt = prompt_template.format(description_text=description_text)
+    messages = _build_messages(description_text)
 
     try:
-        # NEUER, NATIVER AUFRUF mit .parse()
-        completion = azure_client.openai_client.beta.chat.completions.parse(
-            model=model,
-            messages=[
-                {"role": "system", "content": "Extract the event information from the user's description and separate it from the core text."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format=AIResponse, # Direkt die Pydantic-Klasse übergeben
-        )
+        completion = _request_completion(messages, model, azure_client)
+        return _build_result(completion, model, token_tracker)
+
+    except Exception as e:
+        return _fallback_result(description_text, e)
+
+
+def process_description_json(description_text: str, model: str, token_tracker, azure_client: AzureAIClient) -> Tuple[str, bytes]:
+    """
+    Variant of process_description() for consumers that persist the result as
+    JSON anyway: returns the cleaned description and the business value already
+    serialized by pydantic-core (model_dump_json), skipping the dict round-trip.
+    """
+    if not description_text:
+        return "", _EMPTY_BV_JSON
+
+    messages = _build_messages(description_text)
 
-        # Das Ergebnis ist bereits ein Pydantic-Objekt
-        ai_response_object = completion.choices[0].message.parsed
+    try:
+        completion = _request_completion(messages, model, azure_client)
+        ai_response_object = _parse_response(completion, model, token_tracker)
+        return (ai_response_object.cleaned_description.strip(),
+                ai_response_object.business_value.model_dump_json().encode("utf-8"))
+
+    except Exception as e:
+        _report_fallback(e)
+        return description_text.strip(), _EMPTY_BV_JSON
 
-        # Token-Erfassung funktioniert weiterhin
-        if token_tracker and hasattr(completion, 'usage') and completion.usage:
-             usage = completion.usage
-             token_tracker.log_usage(
+
+async def aprocess_description(description_text: str, model: str, token_tracker, azure_client: AzureAIClient,
+                               semaphore: Optional[asyncio.Semaphore] = None) -> dict:
+    """
+    Async variant of process_description() using AsyncAzureOpenAI, so that many
+    descriptions can be analyzed concurrently. An optional semaphore caps the
+    number of in-flight requests.
+    """
+    if not description_text:
+        return {"description": "", "business_value": get_empty_business_value_dict()}
+
+    messages = _build_messages(description_text)
+    async_client = azure_client._initialize_async_openai_client()
+    semaphore = semaphore or asyncio.Semaphore(1)
+
+    try:
+        async with semaphore:
+            # Shares the per-model RPM/TPM budget with the synchronous calls
+            entry = await asyncio.to_thread(get_limiter(model).acquire, _estimate_message_tokens(messages))
+            completion = await async_client.beta.chat.completions.parse(
                 model=model,
-                input_tokens=usage.prompt_tokens,
-                output_tokens=usage.completion_tokens,
-                total_tokens=usage.total_tokens,
-                task_name="business_impact",
+                messages=messages,
+                response_format=AIResponse,
             )
-
-        return {
-            "description": ai_response_object.cleaned_description.strip(),
-            "business_value": ai_response_object.business_value.model_dump(),
-        }
+            if getattr(completion, "usage", None):
+                get_limiter(model).reconcile(entry, completion.usage.total_tokens)
+        return _build_result(completion, model, token_tracker)
 
     except Exception as e:
-        # Das Error-Handling bleibt identisch
-        print(f"Error creating Pydantic object from AI response: {e}. Returning original description and empty business value.")
-        return {
-            "description": description_text.strip(),
-            "business_value": get_empty_business_value_dict(),
-        }
+        return _fallback_result(description_text, e)
+
+
+def process_descriptions_concurrently(descriptions: list, model: str, token_tracker, azure_client: AzureAIClient,
+                                      max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> list:
+    """
+    Runs aprocess_description() for all descriptions concurrently and returns
+    the results in input order.
+    """
+    async def _run():
+        semaphore = asyncio.Semaphore(max_concurrency)
+        try:
+            return await asyncio.gather(*[
+                aprocess_description(d, model, token_tracker, azure_client, semaphore) for d in descriptions
+            ])
+        finally:
+            # Der Async-Client ist an diese Event-Loop gebunden
+            await azure_client.aclose()
+    return asyncio.run(_run())
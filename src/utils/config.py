@@ -1,31 +1,37 @@
 import os
-from dotenv import load_dotenv, find_dotenv
+from pathlib import Path
+from utils.env import ensure_env
 
 # Lade Umgebungsvariablen aus der .env-Datei im Projekt-Root
-load_dotenv(find_dotenv())
+ensure_env()
 
-# Base paths
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-SRC_DIR = os.path.join(BASE_DIR, 'src')
-LOGS_DIR = os.path.join(BASE_DIR, 'logs')
-DATA_DIR = os.path.join(BASE_DIR, 'data')
+# Base paths (einmalig als Path berechnet, als str exportiert)
+BASE_PATH = Path(__file__).resolve().parents[2]
+DATA_PATH = BASE_PATH / 'data'
 
-TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
-PROMPTS_DIR = os.path.join(BASE_DIR, 'prompts')
+BASE_DIR = str(BASE_PATH)
+SRC_DIR = str(BASE_PATH / 'src')
+LOGS_DIR = str(BASE_PATH / 'logs')
+DATA_DIR = str(DATA_PATH)
+
+TEMPLATES_DIR = str(BASE_PATH / 'templates')
+PROMPTS_DIR = str(BASE_PATH / 'prompts')
 
 # Data subdirectories
-JIRA_ISSUES_DIR = os.path.join(DATA_DIR, 'jira_issues')
-HTML_REPORTS_DIR = os.path.join(DATA_DIR, 'html_reports')
-ISSUE_TREES_DIR = os.path.join(DATA_DIR, 'issue_trees')
-JSON_SUMMARY_DIR = os.path.join(DATA_DIR, 'json_summary')
-PLOT_DIR = os.path.join(DATA_DIR, 'plots')
+JIRA_ISSUES_DIR = str(DATA_PATH / 'jira_issues')
+HTML_REPORTS_DIR = str(DATA_PATH / 'html_reports')
+ISSUE_TREES_DIR = str(DATA_PATH / 'issue_trees')
+JSON_SUMMARY_DIR = str(DATA_PATH / 'json_summary')
+PLOT_DIR = str(DATA_PATH / 'plots')
+LLM_CACHE_DIR = str(DATA_PATH / 'llm_cache')
 
 TOKEN_LOG_FILE = os.path.join(LOGS_DIR, "token_usage.jsonl")
 ISSUE_LOG_FILE = os.path.join(LOGS_DIR, "failed_issues.log")
+SUMMARY_CACHE_FILE = os.path.join(JSON_SUMMARY_DIR, "summaries.sqlite")
 
 # Ensure directories exist
-for directory in [LOGS_DIR, JIRA_ISSUES_DIR, HTML_REPORTS_DIR, ISSUE_TREES_DIR, JSON_SUMMARY_DIR]:
-    os.makedirs(directory, exist_ok=True)
+for directory in (LOGS_DIR, JIRA_ISSUES_DIR, HTML_REPORTS_DIR, ISSUE_TREES_DIR, JSON_SUMMARY_DIR, LLM_CACHE_DIR):
+    Path(directory).mkdir(parents=True, exist_ok=True)
 
 # Template file
 EPIC_HTML_TEMPLATE = os.path.join(TEMPLATES_DIR, 'epic-html_template.html')
@@ -67,3 +73,20 @@ JIRA_TREE_FULL = {
     "Initiative": ["realized_by", "child"],
     "Epic": ["issue_in_epic", "realized_by"],
 }
+
+# Anzahl paralleler Worker für die Epic-Verarbeitung (Analyse, Summary, HTML)
+MAX_EPIC_WORKERS = 4
+
+# Präventives Rate-Limiting für LLM-Aufrufe (pro Modell-Deployment)
+LLM_RPM_LIMIT = 60          # Requests pro Minute
+LLM_TPM_LIMIT = 150000      # Tokens pro Minute
+LLM_MAX_RETRIES = 5         # Wiederholungen nach einem 429 (Rate-Limit)
+
+# Anzahl Issues pro JQL-Batch beim finalen Retry (--retry-failed)
+RETRY_BATCH_SIZE = 100
+
+# Projekt-Präfix der Business-Epic-Keys (Vorfilter beim Durchsuchen von JIRA_ISSUES_DIR)
+BUSINESS_EPIC_KEY_PREFIX = "BEMABU-"
+
+# Business-Epic-Beschreibungen bis zu dieser Länge (Zeichen) werden nicht an das LLM geschickt
+MIN_BUSINESS_VALUE_DESCRIPTION_LENGTH = 200
@@ -1,8 +1,9 @@
 """
 Modul zur Extraktion strukturierter Daten von JIRA-Issue-Webseiten.
 
-Dieses Modul bietet die Funktionalität, Daten von JIRA-Webseiten mittels
-Selenium zu parsen und zu extrahieren. Es ist darauf ausgelegt, eine Vielzahl
+Dieses Modul bietet die Funktionalität, Daten von JIRA-Webseiten zu parsen
+und zu extrahieren. Die Seite wird per Selenium geladen und anschließend als
+Snapshot mit lxml ausgewertet. Es ist darauf ausgelegt, eine Vielzahl
 von Feldern und Beziehungen aus JIRA-Issues zu verarbeiten, darunter Titel,
 Beschreibungen, Status, Verantwortliche, Story Points, Akzeptanzkriterien,
 Anhänge sowie verschiedene Arten von Issue-Verknüpfungen.
@@ -14,15 +15,203 @@ gefundenen Beziehungen (z.B. 'is realized by', 'child issues', 'issues in epic')
 in einer einzigen, konsistenten Liste namens `issue_links`.
 """
 
+import lxml.html
+from lxml import etree
+from lxml.etree import XPath
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from bs4 import BeautifulSoup
+import io
+import copy
+import hashlib
 import re
+import logging
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
 from utils.logger_config import logger
+from utils.config import MIN_BUSINESS_VALUE_DESCRIPTION_LENGTH
+
+
+# Issue-Typen, auf deren Seite das per JS nachgeladene "Issues in epic"-Panel erscheint
+_EPIC_PANEL_TYPES = frozenset({"Epic", "Business Epic"})
+
+# Liefert das HTML des Inhaltsbereichs, in dem alle extrahierten Felder liegen
+_CONTENT_SNAPSHOT_JS = "return (document.getElementById('content') || document.body).outerHTML;"
+
+# Liest alle Zeilen des "Issues in epic"-Panels als Liste von {key, url, title}
+_ISSUES_IN_EPIC_JS = """
+return Array.from(document.querySelectorAll('#ghx-issues-in-epic-table tr.issuerow')).map(function (tr) {
+    var key = tr.getAttribute('data-issuekey');
+    var link = tr.querySelector("a[href='/browse/" + key + "']");
+    var summary = tr.querySelector('td.ghx-summary');
+    return {key: key, url: link ? link.href : null, title: summary ? summary.textContent.trim() : null};
+});
+"""
+
+# Vorkompilierte reguläre Ausdrücke
+_ISSUE_KEY_RE = re.compile(r'[A-Z]+-\d+')
+_ICON_RE = re.compile(r'Icon:\s+(.*)')
+_WS_RE = re.compile(r'\s+')
+
+# Vorkompilierte XPath-Ausdrücke für den lxml-Snapshot der Issue-Seite
+_XP_TITLE = XPath("//h2[@id='summary-val']")
+_XP_DESCRIPTION = XPath("//div[contains(@id, 'description') or contains(@class, 'description')]")
+_XP_STATUS = XPath("//a[contains(@class, 'aui-dropdown2-trigger') and contains(@class, 'opsbar-transitions__status-category_')]"
+                   "//span[@class='dropdown-text']")
+_XP_STORY_POINTS = XPath("//strong[@title='Story Points']/following-sibling::div[1]")
+_XP_INPUT = XPath(".//input")
+_XP_ASSIGNEE = XPath("//span[contains(@id, 'assignee') or contains(@class, 'assignee')]")
+_XP_RESOLUTION = XPath("//span[@id='resolution-val']")
+_XP_TARGET_START = XPath("//span[@data-name='Target start']//time[@datetime]")
+_XP_TARGET_END = XPath("//span[@data-name='Target end']//time[@datetime]")
+_XP_TYPE_IMG = XPath("//span[@id='type-val']//img[@alt]")
+_XP_ICON_IMGS = XPath("//img[contains(@alt, 'Icon:')]")
+_XP_FIX_VERSION_LINKS = XPath("//span[@id='fixVersions-field']//a[contains(@href, '/issues/')]")
+_XP_ATTACHMENT_ITEMS = XPath("//ol[@id='attachment_thumbnails' and contains(@class, 'item-attachments')]"
+                             "//li[contains(@class, 'attachment-content')]")
+_XP_ATTACHMENT_SIZE = XPath(".//dd[contains(@class, 'attachment-size')]")
+_XP_TIME = XPath(".//time[@datetime]")
+_XP_BUSINESS_SCOPE_LABEL = XPath("//strong[@title='Business Scope']//label[contains(@for, 'customfield_')]")
+_XP_ACCEPTANCE_LABEL = XPath("//strong[@title='Acceptance Criteria']//label")
+_XP_ACCEPTANCE_ANY = XPath("//*[contains(text(), 'Acceptance Criteria') or contains(@title, 'Acceptance Criteria')]")
+_XP_ACCEPTANCE_FALLBACK_ITEMS = XPath("//ul[preceding::*[contains(text(), 'Acceptance Criteria')]][1]//li")
+_XP_LABEL_LINKS = XPath("//ul[contains(@class, 'labels')]//li/a[@title]")
+_XP_COMPONENT_LINKS = XPath("//span[@id='components-field']//a[contains(@href, '/issues/')]")
+# Vereinigung aus "is realized by"-Links (<a>) und Zeilen der Child-Issue-Tabelle (<tr>), in Dokumentreihenfolge
+_XP_RELATED_NODES = XPath("//dl[contains(@class, 'links-list')]/dt[contains(text(), 'is realized by') or @title='is realized by']"
+                          "/..//a[contains(@class, 'issue-link')]"
+                          " | //table[contains(@class, 'jpo-child-issue-table')]//tr[.//a[contains(@href, '/browse/')]]")
+_XP_BROWSE_LINK = XPath(".//a[contains(@href, '/browse/')]")
+_XP_CELLS = XPath("./td")
+_XP_LINK_SUMMARY = XPath("./ancestor::div[contains(@class, 'link-content')][1]//span[contains(@class, 'link-summary')]")
+
+
+def _has_class(tag, css_class):
+    """Vorkompilierter XPath für ein Nachfahren-Element mit der CSS-Klasse `css_class` (wie BeautifulSoups `class_`)."""
+    return XPath(f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]")
+
+
+# Vorkompilierte XPath-Ausdrücke für den Aktivitätsstrom
+_XP_ACTION_DETAILS = _has_class("div", "action-details")
+_XP_ACTION_BODY = _has_class("div", "action-body")
+_XP_USER_HOVER = _has_class("a", "user-hover")
+_XP_LIVESTAMP = _has_class("time", "livestamp")
+
+# Spalte (Index in `_activity_cells`) je CSS-Klasse einer Änderungszeile
+_ACTIVITY_CELL_CLASSES = {"activity-name": 0, "activity-old-val": 1, "activity-new-val": 2}
+
+
+def _joined_text(node):
+    """Entspricht BeautifulSoups `get_text(strip=True)`: alle Textstücke gestrippt und ohne Trenner verbunden."""
+    return "".join(part.strip() for part in node.itertext())
+
+
+def _activity_cells(row):
+    """
+    Liefert die erste Name-, Alt- und Neu-Zelle einer Änderungszeile (fehlende als None).
+
+    Ein einziger Durchlauf über die `td`-Elemente der Zeile ersetzt die drei
+    getrennten XPath-Suchen pro Zeile.
+    """
+    cells = [None, None, None]
+    for td in row.iter('td'):
+        for css_class in (td.get('class') or '').split():
+            index = _ACTIVITY_CELL_CLASSES.get(css_class)
+            if index is not None and cells[index] is None:
+                cells[index] = td
+    return cells
+
+
+def _clean(value):
+    """Bereinigt Werte wie "Prefix:Value[...id...]" zu "Value"."""
+    return value.rpartition(':')[2].partition('[')[0].strip()
+
+
+def _find_quarter(value):
+    """
+    Liefert das erste Quartalskürzel (`Q\\d_\\d{2}`, z.B. "Q3_25") in `value` oder None.
+
+    Das Muster hat feste Breite, daher genügt ein find('Q') mit Prüfung der
+    vier folgenden Zeichen statt einer Regex-Suche.
+    """
+    i = value.find('Q')
+    while i != -1 and i + 5 <= len(value):
+        if value[i + 1].isdecimal() and value[i + 2] == '_' and value[i + 3:i + 5].isdecimal():
+            return value[i:i + 5]
+        i = value.find('Q', i + 1)
+    return None
+
+
+def _has_business_value(business_value):
+    """True, wenn mindestens ein Feld des Business Value befüllt ist (nicht die leere Fallback-Struktur)."""
+    return any(
+        any(section.values()) if isinstance(section, dict) else bool(section)
+        for section in (business_value or {}).values()
+    )
+
+
+def _absolute_href(link):
+    """
+    Liefert das href eines Links als absolute URL.
+
+    Im HTML stehen relative Pfade (`/browse/KEY`); `driver.get` braucht wie
+    Seleniums `get_attribute('href')` eine absolute URL. Aufgelöst wird gegen
+    die beim Parsen übergebene Seiten-URL (`base_url`).
+    """
+    href = link.get("href")
+    return urljoin(link.base_url or "", href) if href else href
+
+
+def _extract_key(value):
+    """
+    Liefert den ersten Jira-Key (`[A-Z]+-\\d+`) in `value` oder None.
+
+    Gleichwertig zu `_ISSUE_KEY_RE.search`, aber ohne Regex-Engine: von jedem
+    Bindestrich aus wird nach links über Großbuchstaben und nach rechts über
+    Ziffern erweitert.
+    """
+    dash = value.find('-')
+    while dash != -1:
+        start = dash
+        while start > 0 and 'A' <= value[start - 1] <= 'Z':
+            start -= 1
+        end = dash + 1
+        while end < len(value) and value[end].isdecimal():
+            end += 1
+        if start < dash and end > dash + 1:
+            return value[start:end]
+        dash = value.find('-', dash + 1)
+    return None
+
+
+def _iter_action_containers(html_content):
+    """
+    Liefert die 'actionContainer'-Divs des Aktivitätsstroms per iterparse.
+
+    Jeder Container wird nach der Verarbeitung geleert und samt bereits
+    abgearbeiteter Geschwister aus dem Baum entfernt, sodass nie die ganze
+    Seite im Speicher liegt. Container sind nicht verschachtelt; ihre
+    Kind-Divs sind beim 'end'-Event des Containers bereits vollständig.
+    """
+    source = io.BytesIO(html_content.encode('utf-8'))
+    for _, elem in etree.iterparse(source, events=("end",), tag="div", html=True, encoding="utf-8"):
+        if "actionContainer" not in (elem.get("class") or "").split():
+            continue
+        yield elem
+        elem.clear()
+        parent = elem.getparent()
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+def _text(node):
+    return node.text_content().strip()
+
+
+def _datetime(node):
+    return node.get("datetime")
 
 
 class DataExtractor:
@@ -52,6 +241,17 @@ class DataExtractor:
     von JIRA variiert.
     """
 
+    # (Feld, XPath, Extraktor) für alle Felder, die aus genau einem Element gelesen werden
+    _FIELD_SPECS = (
+        ("title", _XP_TITLE, _text),
+        ("description", _XP_DESCRIPTION, _text),
+        ("status", _XP_STATUS, _text),
+        ("assignee", _XP_ASSIGNEE, _text),
+        ("resolution", _XP_RESOLUTION, _text),
+        ("target_start", _XP_TARGET_START, _datetime),
+        ("target_end", _XP_TARGET_END, _datetime),
+    )
+
     def __init__(self, description_processor=None, model="claude-3-7-sonnet-latest", token_tracker=None, azure_client=None):
         """
         Initialisiert den DataExtractor.
@@ -72,161 +272,123 @@ class DataExtractor:
         self.model = model
         self.token_tracker = token_tracker
         self.azure_client = azure_client
+        # Ergebnisse des description_processor, Schlüssel: blake2b-Hash der Beschreibung
+        self._business_value_cache = {}
 
 
-    def _extract_story_points(self, driver):
+    @staticmethod
+    def _extract_story_points(tree):
         """
-        Extrahiert die Story Points von der Seite.
+        Extrahiert die Story Points aus dem geparsten Seitenbaum.
 
         Die Methode ist robust und prüft zuerst, ob der Wert in einem
         <input>-Feld vorliegt (wie es beim Bearbeiten eines Issues der Fall ist)
         und greift andernfalls auf den sichtbaren Text des Containers zurück.
         """
-        try:
-            # Finde das <strong>-Element mit dem Titel "Story Points" und wähle
-            # das direkt folgende <div>-Geschwisterelement aus.
-            value_container = driver.find_element(By.XPATH, "//strong[@title='Story Points']/following-sibling::div[1]")
-
-            # Prüfe, ob sich der Wert in einem <input>-Feld befindet
-            try:
-                input_element = value_container.find_element(By.TAG_NAME, "input")
-                return input_element.get_attribute("value")
-            except NoSuchElementException:
-                # Wenn kein <input>, nimm den sichtbaren Text des Containers
-                return value_container.text.strip()
-        except NoSuchElementException:
+        # Finde das <strong>-Element mit dem Titel "Story Points" und wähle
+        # das direkt folgende <div>-Geschwisterelement aus.
+        containers = _XP_STORY_POINTS(tree)
+        if not containers:
             # Wenn das Feld gar nicht existiert
             return "n/a"
+        value_container = containers[0]
+
+        # Prüfe, ob sich der Wert in einem <input>-Feld befindet
+        inputs = _XP_INPUT(value_container)
+        if inputs:
+            return inputs[0].get("value")
+        # Wenn kein <input>, nimm den sichtbaren Text des Containers
+        return value_container.text_content().strip()
 
     @staticmethod
-    def _find_child_issues(driver):
+    def _find_child_issues(rows):
         """
-        Sucht nach Child Issues in der dedizierten Tabelle auf der Seite.
+        Baut die Child Issues aus den Zeilen der Child-Issue-Tabelle.
+
+        Key, URL und Summary (2. Zelle) werden direkt aus der jeweiligen
+        Zeile gelesen.
         """
         child_issues = []
 
-        try:
-            # Suche nach der Child-Issue-Tabelle
-            child_table = driver.find_element(By.XPATH, "//table[contains(@class, 'jpo-child-issue-table')]")
-
-            # Finde alle Links in der Tabelle
-            child_links = child_table.find_elements(By.XPATH, ".//a[contains(@href, '/browse/')]")
-
-            if child_links:
-                logger.info(f"Gefunden: {len(child_links)} Child Issues")
-
-                # Verarbeite jeden Child-Issue-Link
-                for child_link in child_links:
-                    # Extrahiere Issue-Schlüssel und URL
-                    child_key = child_link.text.strip()
-                    child_href = child_link.get_attribute("href")
+        if not rows:
+            logger.debug("Keine Child Issues gefunden")
+            return child_issues
 
-                    # Überspringe leere oder ungültige Links
-                    if not child_key or not re.match(r'[A-Z]+-\d+', child_key):
-                        continue
-
-                    logger.info(f"Child Issue gefunden: {child_key}")
-
-                    # Versuche, den Summary-Text zu finden (falls vorhanden)
-                    try:
-                        # Finde das übergeordnete tr-Element
-                        parent_row = child_link.find_element(By.XPATH, "./ancestor::tr")
+        logger.debug("Gefunden: %s Child Issues", len(rows))
 
-                        # Suche nach der Zelle mit der Zusammenfassung (normalerweise die 2. oder 3. Zelle)
-                        summary_cells = parent_row.find_elements(By.XPATH, "./td")
-                        summary_text = ""
+        for row in rows:
+            # Extrahiere Issue-Schlüssel und URL
+            child_link = _XP_BROWSE_LINK(row)[0]
+            child_key = child_link.text_content().strip()
 
-                        if len(summary_cells) >= 2:
-                            # Die 2. Zelle enthält oft die Zusammenfassung
-                            summary_text = summary_cells[1].text.strip()
+            # Überspringe leere oder ungültige Links
+            if not child_key or not _ISSUE_KEY_RE.match(child_key):
+                continue
 
-                    except Exception as e:
-                        summary_text = ""
-                        logger.debug(f"Konnte Summary für Child Issue {child_key} nicht extrahieren")
+            logger.debug("Child Issue gefunden: %s", child_key)
 
-                    # Füge die Informationen zur child_issues-Liste hinzu
-                    child_issue_item = {
-                        "key": child_key,
-                        "title": child_key,  # Title ist oft nur der Key
-                        "summary": summary_text,
-                        "url": child_href
-                    }
+            # Die 2. Zelle enthält oft die Zusammenfassung
+            cells = _XP_CELLS(row)
+            summary_text = cells[1].text_content().strip() if len(cells) >= 2 else ""
 
-                    child_issues.append(child_issue_item)
-
-        except Exception as e:
-            logger.info(f"Keine Child Issues gefunden")
+            child_issues.append({
+                "key": child_key,
+                "title": child_key,  # Title ist oft nur der Key
+                "summary": summary_text,
+                "url": _absolute_href(child_link)
+            })
 
         return child_issues
 
 
     @staticmethod
-    def _extract_business_scope(driver):
+    def _extract_business_scope(tree):
         """
         Extrahiert den "Business Scope"-Text aus der Jira-Seite.
 
-        Implementiert mehrere Fallback-Mechanismen, um den Text auch aus
-        komplexeren HTML-Strukturen (z.B. 'flooded' divs) zuverlässig zu
-        extrahieren.
+        `text_content()` sammelt den Text aller Nachfahren des Wert-Elements
+        ein, verschachtelte Strukturen (z.B. 'flooded' divs) sind damit
+        bereits abgedeckt. Whitespace wird zu einzelnen Leerzeichen
+        zusammengefasst.
         """
-        business_scope = ""
-
-        try:
-            # Suche nach dem Label mit title="Business Scope"
-            business_scope_label = driver.find_element(By.XPATH,
-                "//strong[@title='Business Scope']//label[contains(@for, 'customfield_')]")
-
-            # Hole die customfield_id
-            field_id = business_scope_label.get_attribute("for")
-
-            # Suche nach dem zugehörigen Wert-Element
-            business_scope_div = driver.find_element(By.XPATH, f"//div[@id='{field_id}-val']")
-
-            # Robustere Extraktion des Textes - versuche verschiedene Wege
-            # 1. Versuche zuerst, direkt den Text zu holen
-            business_scope = business_scope_div.text.strip()
-
-            # 2. Wenn der Text leer ist, versuche es mit flooded divs
-            if not business_scope:
-                # Suche nach allen div-Elementen mit Klasse 'flooded' innerhalb des Haupt-divs
-                flooded_divs = business_scope_div.find_elements(By.XPATH, ".//div[contains(@class, 'flooded')]")
-
-                # Sammle den Text aus allen gefundenen Elementen
-                texts = []
-                for div in flooded_divs:
-                    div_text = div.text.strip()
-                    if div_text:
-                        texts.append(div_text)
-
-                # Füge alle gefundenen Texte zusammen
-                business_scope = "\n".join(texts)
-
-            # Wenn immer noch leer, extrahiere den HTML-Inhalt und versuche es manuell zu parsen
-            if not business_scope:
-                html_content = business_scope_div.get_attribute('innerHTML')
-                # Entferne HTML-Tags mit einem einfachen Ansatz (für komplexere Fälle könnte BeautifulSoup verwendet werden)
-                import re
-                business_scope = re.sub(r'<[^>]*>', ' ', html_content)
-                business_scope = re.sub(r'\s+', ' ', business_scope).strip()
-
-            if business_scope:
-                logger.info(f"Business Scope gefunden: {business_scope[:50]}...")
-            else:
-                logger.info("Business Scope gefunden, aber Text ist leer")
-
-        except Exception as e:
-            logger.info(f"Business Scope konnte nicht extrahiert werden")
+        # Suche nach dem Label mit title="Business Scope" und hole die customfield_id
+        labels = _XP_BUSINESS_SCOPE_LABEL(tree)
+        if not labels:
+            logger.debug("Business Scope konnte nicht extrahiert werden")
+            return ""
+        field_id = labels[0].get("for")
+
+        # Suche nach dem zugehörigen Wert-Element
+        business_scope_divs = tree.xpath(f"//div[@id='{field_id}-val']")
+        if not business_scope_divs:
+            logger.debug("Business Scope konnte nicht extrahiert werden")
+            return ""
+
+        business_scope = _WS_RE.sub(' ', business_scope_divs[0].text_content()).strip()
+
+        if business_scope:
+            logger.debug("Business Scope gefunden: %.50s...", business_scope)
+        else:
+            logger.debug("Business Scope gefunden, aber Text ist leer")
 
         return business_scope
 
 
-    def extract_issue_data(self, driver, issue_key):
+    def extract_issue_data(self, driver, issue_key, html_content=None):
         """
         Extrahiert umfassende Daten eines Jira-Issues in ein strukturiertes Format.
 
         Diese Methode ist der primäre Extraktionsmotor. Sie durchsucht die
         Jira-Seite systematisch nach einer Vielzahl von Metadaten und Inhalten.
 
+        Alle statischen Felder werden aus einem einzigen Snapshot des DOMs
+        gelesen (`page_source`, geparst mit lxml), statt pro Feld eine eigene
+        Selenium-Abfrage an den Browser zu schicken. Nur das per JavaScript
+        nachgeladene "Issues in epic"-Panel wird weiterhin live über den
+        Treiber abgefragt. Liegt der HTML-Inhalt der Seite bereits vor, kann er
+        über `html_content` übergeben werden; andernfalls wird nur der
+        `#content`-Bereich aus dem Browser geholt.
+
         Ein Schlüsselmerkmal ist die Aggregation aller gefundenen Issue-
         Beziehungen ("is realized by", "child issues", "issues in epic") in
         eine einzige Liste `issue_links`. Jeder Eintrag in dieser Liste wird mit
@@ -257,301 +419,268 @@ class DataExtractor:
             "issue_links": [],
             "attachments": [],
         }
+        # Bereits in 'issue_links' aufgenommene Keys für O(1)-Duplikatprüfung
+        seen_keys = set()
+
+        if html_content is None:
+            # Nur den Inhaltsbereich serialisieren statt des kompletten DOMs (Sidebars, Popups, ...)
+            html_content = driver.execute_script(_CONTENT_SNAPSHOT_JS)
+        # Seiten-URL als base_url, damit relative Links absolut aufgelöst werden können
+        tree = lxml.html.fromstring(html_content, base_url=driver.current_url)
+        self._parse_static_fields(tree, data, seen_keys)
+
+        # Der Business Value (LLM-Aufruf) läuft parallel zur Abfrage des
+        # "Issues in epic"-Panels im Browser; beide schreiben disjunkte Felder.
+        if (data["issue_type"] == 'Business Epic' and self.description_processor is not None
+                and len(data["description"].strip()) > MIN_BUSINESS_VALUE_DESCRIPTION_LENGTH):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                bv_future = executor.submit(self._process_business_value, data)
+                self._extract_issues_in_epic(driver, data, seen_keys)
+                bv_future.result()
+        else:
+            self._extract_issues_in_epic(driver, data, seen_keys)
 
-        # Title
-        try:
-            title_elem = driver.find_element(By.XPATH, "//h2[@id='summary-val']")
-            data["title"] = title_elem.text.strip()
-            logger.info(f"Titel gefunden: {data['title']}")
-        except Exception as e:
-            logger.info(f"Titel nicht gefunden: {e}")
+        return data
 
-        # Description
-        try:
-            desc_elem = driver.find_element(By.XPATH, "//div[contains(@id, 'description') or contains(@class, 'description')]")
-            data["description"] = desc_elem.text
-            logger.info(f"Beschreibung gefunden ({len(desc_elem.text)} Zeichen)")
-        except Exception as e:
-            logger.info(f"Beschreibung nicht gefunden: {e}")
 
-        # Business Scope extrahieren und zur Description hinzufügen:
-        try:
-            business_scope = DataExtractor._extract_business_scope(driver)
-            if business_scope:
-                if data["description"]:
-                    data["description"] += "\n\nBusiness Scope:\n" + business_scope
-                else:
-                    data["description"] = "Business Scope:\n" + business_scope
-                logger.info(f"Business Scope zur Description hinzugefügt ({len(business_scope)} Zeichen)")
-        except Exception as e:
-            logger.info(f"Business Scope konnte nicht extrahiert werden")
+    def _process_business_value(self, data):
+        """
+        Ergänzt bei 'Business Epics' den Business Value über den
+        `description_processor` und ersetzt die Beschreibung durch die bereinigte Fassung.
 
-        # Status
+        Identische Beschreibungen werden nur einmal an das LLM geschickt; das
+        Ergebnis wird pro Instanz unter einem Hash der Beschreibung gecacht,
+        sofern es einen befüllten Business Value enthält.
+        """
+        cache_key = hashlib.blake2b(data["description"].encode('utf-8'), digest_size=16).hexdigest()
         try:
-            status_button = driver.find_element(By.XPATH, "//a[contains(@class, 'aui-dropdown2-trigger') and contains(@class, 'opsbar-transitions__status-category_')]")
-            status_span = status_button.find_element(By.XPATH, ".//span[@class='dropdown-text']")
-            data["status"] = status_span.text
-            logger.info(f"Status gefunden: {status_span.text}")
-        except Exception as e:
-            logger.info(f"Status nicht gefunden")
+            processed_text = self._business_value_cache.get(cache_key)
+            if processed_text is None:
+                processed_text = self.description_processor(
+                    data["description"], self.model, self.token_tracker, self.azure_client
+                )
+                # Die leere Fallback-Struktur eines fehlgeschlagenen Aufrufs nicht cachen,
+                # sonst bekämen alle späteren Issues mit gleicher Beschreibung keinen Business Value
+                if _has_business_value(processed_text['business_value']):
+                    self._business_value_cache[cache_key] = processed_text
+            else:
+                logger.info("Business Value aus Cache übernommen")
+            data["description"] = processed_text['description']
+            data["business_value"] = copy.deepcopy(processed_text['business_value'])
+            logger.info("Business Value ergänzt")
+        except Exception as bv_error:
+            logger.error(f"Fehler bei der Verarbeitung des Business Value: {bv_error}")
 
-        # Story Points
-        data["story_points"] = self._extract_story_points(driver)
-        logger.info(f"Story Points direkt extrahiert: {data['story_points']}")
 
-        # Assignee
-        try:
-            assignee_elem = driver.find_element(By.XPATH, "//span[contains(@id, 'assignee') or contains(@class, 'assignee')]")
-            data["assignee"] = assignee_elem.text
-            logger.info(f"Assignee gefunden: {assignee_elem.text}")
-        except Exception as e:
-            logger.info(f"Assignee nicht gefunden")
+    @staticmethod
+    def _extract_issues_in_epic(driver, data, seen_keys):
+        """
+        Extrahiert die "Issues in epic" und fügt sie direkt zu 'issue_links' hinzu.
+
+        Das Panel wird per JavaScript nachgeladen und deshalb live über den
+        Treiber abgefragt. Es existiert nur bei Epics; für alle anderen Typen
+        wird gar nicht erst gewartet.
+        """
+        if data["issue_type"] not in _EPIC_PANEL_TYPES:
+            return
 
-        # Resolution <-- NEUER BLOCK START
+        # Implizites Warten abschalten, damit fehlende Elemente sofort auffallen;
+        # gewartet wird ausschließlich explizit über WebDriverWait.
+        orig_implicit_wait = driver.timeouts.implicit_wait
+        driver.implicitly_wait(0)
         try:
-            resolution_elem = driver.find_element(By.XPATH, "//span[@id='resolution-val']")
-            data["resolution"] = resolution_elem.text.strip()
-            logger.info(f"Resolution gefunden: {data['resolution']}")
+            # Kurzes, explizites Warten auf den Container, der per JS nachgeladen wird
+            wait = WebDriverWait(driver, 0.5, poll_frequency=0.1)
+            wait.until(EC.presence_of_element_located((By.ID, "greenhopper-epics-issue-web-panel-label")))
+
+            # Alle Zeilen in einem einzigen Skriptaufruf auslesen statt mehrerer Round-Trips pro Zeile
+            issue_rows = driver.execute_script(_ISSUES_IN_EPIC_JS)
+
+            if issue_rows:
+                logger.info("%s 'Issues in epic' in der Tabelle gefunden.", len(issue_rows))
+                for row in issue_rows:
+                    key = row.get("key")
+                    if not key or not row.get("url") or row.get("title") is None:
+                        logger.warning(f"Konnte eine Zeile im 'Issues in epic'-Panel nicht parsen: {row}")
+                        continue
+                    if key not in seen_keys:
+                        seen_keys.add(key)
+                        data["issue_links"].append({
+                            "key": key,
+                            "title": row["title"],
+                            "summary": row["title"],
+                            "url": row["url"],
+                            "relation_type": "issue_in_epic"
+                        })
+        except TimeoutException:
+            # Epic ohne zugeordnete Issues oder Panel nicht rechtzeitig geladen. Kein Fehler.
+            logger.debug("Abschnitt 'Issues in epic' nicht gefunden oder nicht rechtzeitig geladen.")
         except Exception as e:
-            # Dies ist ein erwarteter Fall für offene Issues.
-            logger.info(f"Resolution nicht gefunden (normal bei 'Unresolved' Issues)")
-        # NEUER BLOCK ENDE -->
+            logger.info(f"Ein unerwarteter Fehler ist bei der Extraktion von 'Issues in epic' aufgetreten")
+        finally:
+            driver.implicitly_wait(orig_implicit_wait)
+
+
+    def _parse_static_fields(self, tree, data, seen_keys):
+        """
+        Liest alle statischen Felder aus dem geparsten Seitenbaum in `data`.
+
+        Arbeitet ausschließlich auf dem lxml-Baum und verursacht damit keine
+        Round-Trips zum Browser. Einfache Felder werden über `_FIELD_SPECS`
+        abgearbeitet; fehlende Elemente erkennt man an einer leeren
+        Ergebnisliste statt an einer Exception. Die bisherigen
+        Fallback-Strategien laufen auf demselben Baum.
+        """
+        # Einfache Felder (Title, Description, Status, Assignee, Resolution, Target Start/End)
+        for name, xpath, extractor in self._FIELD_SPECS:
+            nodes = xpath(tree)
+            if nodes:
+                data[name] = extractor(nodes[0])
+                logger.debug("%s gefunden: %s", name, data[name])
+            else:
+                logger.debug("%s nicht gefunden", name)
+
+        # Business Scope extrahieren und zur Description hinzufügen:
+        business_scope = DataExtractor._extract_business_scope(tree)
+        if business_scope:
+            if data["description"]:
+                data["description"] += "\n\nBusiness Scope:\n" + business_scope
+            else:
+                data["description"] = "Business Scope:\n" + business_scope
+            logger.debug("Business Scope zur Description hinzugefügt (%s Zeichen)", len(business_scope))
+
+        # Story Points
+        data["story_points"] = self._extract_story_points(tree)
+        logger.debug("Story Points direkt extrahiert: %s", data['story_points'])
 
         # Issue Type
-        try:
-            issue_type_container = driver.find_element(By.XPATH, "//span[@id='type-val']")
-            issue_type_img = issue_type_container.find_element(By.XPATH, ".//img[@alt]")
-            alt_text = issue_type_img.get_attribute("alt")
-            match = re.match(r'Icon:\s+(.*)', alt_text)
+        type_imgs = _XP_TYPE_IMG(tree)
+        if type_imgs:
+            alt_text = type_imgs[0].get("alt")
+            match = _ICON_RE.match(alt_text)
             if match:
-                issue_type = match.group(1).strip()
-                data["issue_type"] = issue_type
-                logger.info(f"Issue Type gefunden (aus alt-Attribut): {issue_type}")
+                data["issue_type"] = match.group(1).strip()
+                logger.debug("Issue Type gefunden (aus alt-Attribut): %s", data['issue_type'])
             else:
-                issue_type = issue_type_img.get_attribute("title")
-                data["issue_type"] = issue_type
-                logger.info(f"Issue Type gefunden (aus title-Attribut): {issue_type}")
-        except Exception as e:
-            # Fallback-Block für Issue Type
-            logger.info(f"Issue Type mit primärer Methode nicht gefunden, starte Fallback...")
-            try:
-                issue_type_elements = driver.find_elements(By.XPATH, "//img[contains(@alt, 'Icon:')]")
-                for img in issue_type_elements:
-                    alt_text = img.get_attribute("alt")
-                    if alt_text:
-                        match = re.match(r'Icon:\s+(.*)', alt_text)
-                        if match:
-                            issue_type = match.group(1).strip()
-                            data["issue_type"] = issue_type
-                            logger.info(f"Issue Type mit Fallback-Methode gefunden (aus alt-Attribut): {issue_type}")
-                            break
-                if not data["issue_type"]:
-                    logger.warning("Issue Type auch mit Fallback-Methode nicht gefunden.")
-            except Exception as fallback_e:
-                logger.error(f"Issue Type mit beiden Methoden nicht gefunden: {e}, {fallback_e}")
-
-        # Business Value nur bei 'Business Epic' verarbeiten
-        if data["issue_type"] == 'Business Epic' and self.description_processor is not None:
-            try:
-                processed_text = self.description_processor(
-                    data["description"], self.model, self.token_tracker, self.azure_client
-                )
-                data["description"] = processed_text['description']
-                data["business_value"] = processed_text['business_value']
-                logger.info(f"Business Value ergänzt")
-            except Exception as bv_error:
-                logger.error(f"Fehler bei der Verarbeitung des Business Value: {bv_error}")
+                data["issue_type"] = type_imgs[0].get("title")
+                logger.debug("Issue Type gefunden (aus title-Attribut): %s", data['issue_type'])
+        else:
+            # Fallback für Issue Type
+            logger.debug("Issue Type mit primärer Methode nicht gefunden, starte Fallback...")
+            for img in _XP_ICON_IMGS(tree):
+                match = _ICON_RE.match(img.get("alt") or "")
+                if match:
+                    data["issue_type"] = match.group(1).strip()
+                    logger.debug("Issue Type mit Fallback-Methode gefunden (aus alt-Attribut): %s", data['issue_type'])
+                    break
+            if not data["issue_type"]:
+                logger.warning("Issue Type auch mit Fallback-Methode nicht gefunden.")
 
         # fixVersion Daten
-        try:
-           fix_version_span = driver.find_element(By.XPATH, "//span[@id='fixVersions-field']")
-           fix_version_links = fix_version_span.find_elements(By.XPATH, ".//a[contains(@href, '/issues/')]")
-           for link in fix_version_links:
-               link_html = link.get_attribute("outerHTML")
-               match = re.search(r'>([^<]+)</a>', link_html)
-               if match:
-                   version = match.group(1).strip()
-                   if version and version not in data["fix_versions"]:
-                       data["fix_versions"].append(version)
-           logger.info(f"{len(data['fix_versions'])} Fix Versions gefunden: {', '.join(data['fix_versions'])}")
-        except Exception as e:
-           logger.info(f"Fix Versions nicht gefunden")
-
-        # Target Start und Target End Daten
-        try:
-            target_start_span = driver.find_element(By.XPATH, "//span[@data-name='Target start']")
-            target_start_time = target_start_span.find_element(By.XPATH, ".//time[@datetime]")
-            data["target_start"] = target_start_time.get_attribute("datetime")
-            logger.info(f"Target Start-Datum gefunden: {data['target_start']}")
-        except Exception as e:
-            logger.info(f"Target Start-Datum nicht gefunden")
-        try:
-            target_end_span = driver.find_element(By.XPATH, "//span[@data-name='Target end']")
-            target_end_time = target_end_span.find_element(By.XPATH, ".//time[@datetime]")
-            data["target_end"] = target_end_time.get_attribute("datetime")
-            logger.info(f"Target End-Datum gefunden: {data['target_end']}")
-        except Exception as e:
-            logger.info(f"Target End-Datum nicht gefunden")
+        # dict.fromkeys dedupliziert in O(1) und behält die Reihenfolge der Seite bei
+        fix_versions = dict.fromkeys(link.text_content().strip() for link in _XP_FIX_VERSION_LINKS(tree))
+        fix_versions.pop("", None)
+        data["fix_versions"] = list(fix_versions)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s Fix Versions gefunden: %s", len(data['fix_versions']), ', '.join(data['fix_versions']))
 
         # Attachments
-        try:
-            attachments_list = driver.find_element(By.XPATH, "//ol[@id='attachment_thumbnails' and contains(@class, 'item-attachments')]")
-            attachment_items = attachments_list.find_elements(By.XPATH, ".//li[contains(@class, 'attachment-content')]")
-            for item in attachment_items:
-                try:
-                    download_url = item.get_attribute("data-downloadurl")
-                    if download_url:
-                        parts = download_url.split(":", 2)
-                        if len(parts) >= 3:
-                            attachment_item = {
-                                "filename": parts[1], "url": parts[2], "mime_type": parts[0],
-                                "size": item.find_element(By.XPATH, ".//dd[contains(@class, 'attachment-size')]").text.strip(),
-                                "date": item.find_element(By.XPATH, ".//time[@datetime]").get_attribute("datetime")
-                            }
-                            data["attachments"].append(attachment_item)
-                except Exception as item_error:
-                    logger.info(f"Fehler beim Extrahieren eines Anhangs: {item_error}")
-            logger.info(f"{len(data['attachments'])} Anhänge gefunden")
-        except Exception as e:
-            logger.info(f"Keine Anhänge gefunden")
+        for item in _XP_ATTACHMENT_ITEMS(tree):
+            download_url = item.get("data-downloadurl")
+            if not download_url:
+                continue
+            parts = download_url.split(":", 2)
+            if len(parts) < 3:
+                continue
+            sizes = _XP_ATTACHMENT_SIZE(item)
+            times = _XP_TIME(item)
+            data["attachments"].append({
+                "filename": parts[1], "url": parts[2], "mime_type": parts[0],
+                "size": sizes[0].text_content().strip() if sizes else "",
+                "date": times[0].get("datetime") if times else ""
+            })
+        logger.info("%s Anhänge gefunden", len(data['attachments']))
 
         # Acceptance Criteria
-        try:
-            acceptance_title = driver.find_element(By.XPATH, "//strong[@title='Acceptance Criteria']")
-            label_elem = acceptance_title.find_element(By.XPATH, ".//label")
-            field_id = label_elem.get_attribute("for")
-            acceptance_field = driver.find_element(By.XPATH, f"//div[@id='{field_id}-val']")
-            criteria_items = acceptance_field.find_elements(By.XPATH, ".//ul/li")
-            if not criteria_items: criteria_items = acceptance_field.find_elements(By.XPATH, ".//p")
+        labels = _XP_ACCEPTANCE_LABEL(tree)
+        field_id = labels[0].get("for") if labels else None
+        acceptance_fields = tree.xpath(f"//div[@id='{field_id}-val']") if field_id else []
+        if acceptance_fields:
+            criteria_items = acceptance_fields[0].xpath(".//ul/li") or acceptance_fields[0].xpath(".//p")
             for item in criteria_items:
-                criterion_text = item.text.strip()
+                criterion_text = item.text_content().strip()
                 if criterion_text: data["acceptance_criteria"].append(criterion_text)
-            logger.info(f"{len(data['acceptance_criteria'])} Acceptance Criteria gefunden")
-        except Exception as e:
-            # Fallback-Block für Acceptance Criteria
-            logger.info(f"Acceptance Criteria mit primärer Methode nicht gefunden, starte Fallback...")
-            try:
-                acceptance_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Acceptance Criteria') or contains(@title, 'Acceptance Criteria')]")
-                if acceptance_elements:
-                    ul_elements = driver.find_elements(By.XPATH, "//ul[preceding::*[contains(text(), 'Acceptance Criteria')]][1]//li")
-                    if ul_elements:
-                        for item in ul_elements:
-                            criterion_text = item.text.strip()
-                            if criterion_text and criterion_text not in data["acceptance_criteria"]:
-                                data["acceptance_criteria"].append(criterion_text)
-                logger.info(f"Mit Fallback-Methode {len(data['acceptance_criteria'])} Acceptance Criteria gefunden")
-            except Exception as fallback_e:
-                logger.error(f"Acceptance Criteria mit beiden Methoden nicht gefunden")
+            logger.debug("%s Acceptance Criteria gefunden", len(data['acceptance_criteria']))
+        else:
+            # Fallback für Acceptance Criteria
+            logger.debug("Acceptance Criteria mit primärer Methode nicht gefunden, starte Fallback...")
+            if _XP_ACCEPTANCE_ANY(tree):
+                for item in _XP_ACCEPTANCE_FALLBACK_ITEMS(tree):
+                    criterion_text = item.text_content().strip()
+                    if criterion_text and criterion_text not in data["acceptance_criteria"]:
+                        data["acceptance_criteria"].append(criterion_text)
+            logger.debug("Mit Fallback-Methode %s Acceptance Criteria gefunden", len(data['acceptance_criteria']))
 
         # Labels
-        try:
-            labels_ul = driver.find_element(By.XPATH, "//ul[contains(@class, 'labels')]")
-            label_links = labels_ul.find_elements(By.XPATH, ".//li/a[@title]")
-            for label_link in label_links:
-                label_title = label_link.get_attribute("title")
-                if label_title: data["labels"].append(label_title)
-            logger.info(f"{len(data['labels'])} Labels gefunden: {', '.join(data['labels'])}")
-        except Exception as e:
-            logger.info(f"Labels nicht gefunden")
+        for label_link in _XP_LABEL_LINKS(tree):
+            label_title = label_link.get("title")
+            if label_title: data["labels"].append(label_title)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s Labels gefunden: %s", len(data['labels']), ', '.join(data['labels']))
 
         # Components
-        try:
-            components_container = driver.find_element(By.XPATH, "//span[@id='components-field']")
-            component_links = components_container.find_elements(By.XPATH, ".//a[contains(@href, '/issues/')]")
-            for comp_link in component_links:
-                component_code = comp_link.text.strip()
-                if component_code: data["components"].append({"code": component_code, "title": comp_link.get_attribute("title")})
-            logger.info(f"{len(data['components'])} Components gefunden: {', '.join([comp['code'] for comp in data['components']])}")
-        except Exception as e:
-            logger.info(f"Keine Components gefunden")
-
-        # 1. "is realized by" Links extrahieren und direkt zu 'issue_links' hinzufügen
-        try:
-            link_elements = driver.find_elements(By.XPATH,
-                "//dl[contains(@class, 'links-list')]/dt[contains(text(), 'is realized by') or @title='is realized by']"
-                "/..//a[contains(@class, 'issue-link')]")
-
-            for link in link_elements:
-                issue_key_attr = (link.get_attribute("data-issue-key") or link.text.strip()).replace('\u200b', '')
-
-                # Optional: Versuche, den Summary-Text zu finden
-                summary_text = ""
-                try:
-                    parent_element = link.find_element(By.XPATH, "./ancestor::div[contains(@class, 'link-content')]")
-                    summary_element = parent_element.find_element(By.XPATH, ".//span[contains(@class, 'link-summary')]")
-                    summary_text = summary_element.text.strip()
-                except:
-                    pass # Summary ist optional
-
-                link_item = {
-                    "key": issue_key_attr,
-                    "title": link.text.strip(),
-                    "summary": summary_text,
-                    "url": link.get_attribute("href"),
-                    "relation_type": "realized_by"  # Beziehungstyp direkt hier setzen
-                }
-
-                # Nur hinzufügen, wenn der Key noch nicht in der Zielliste ist
-                if not any(item["key"] == link_item["key"] for item in data["issue_links"]):
-                    data["issue_links"].append(link_item)
-
-            if link_elements:
-                logger.info(f"{len(link_elements)} 'is realized by' Links zu 'issue_links' hinzugefügt.")
-        except Exception as e:
-            logger.info(f"'is realized by' Links konnten nicht gefunden werden")
-
-        # 2. Child Issues extrahieren und direkt zu 'issue_links' hinzufügen
-        try:
-            child_issues = DataExtractor._find_child_issues(driver) # Nur einmal aufrufen
-            initial_link_count = len(data["issue_links"])
-
-            for child in child_issues:
-                # Prüfen, ob das Child Issue bereits in der Zielliste ist
-                if not any(item["key"] == child["key"] for item in data["issue_links"]):
-                    child["relation_type"] = "child"  # Beziehungstyp setzen
-                    data["issue_links"].append(child)
-
-            added_children = len(data["issue_links"]) - initial_link_count
-            if added_children > 0:
-                logger.info(f"{added_children} Child Issues zu 'issue_links' hinzugefügt.")
-        except Exception as e:
-             logger.info(f"Fehler bei der Verarbeitung von Child Issues")
-
-
-        # 3. "Issues in epic" extrahieren und direkt zu 'issue_links' hinzufügen
-        try:
-            # Kurzes, explizites Warten auf den Container, der per JS nachgeladen wird
-            wait = WebDriverWait(driver, 2)
-            wait.until(EC.element_to_be_clickable((By.ID, "greenhopper-epics-issue-web-panel-label")))
-
-            issue_table = driver.find_element(By.ID, "ghx-issues-in-epic-table")
-            issue_rows = issue_table.find_elements(By.XPATH, ".//tr[contains(@class, 'issuerow')]")
-
-            if issue_rows:
-                logger.info(f"{len(issue_rows)} 'Issues in epic' in der Tabelle gefunden.")
-                for row in issue_rows:
-                    try:
-                        key = row.get_attribute('data-issuekey')
-                        if not any(item["key"] == key for item in data["issue_links"]):
-                            url_element = row.find_element(By.XPATH, f".//a[@href='/browse/{key}']")
-                            title_element = row.find_element(By.XPATH, ".//td[contains(@class, 'ghx-summary')]")
-
-                            data["issue_links"].append({
-                                "key": key,
-                                "title": title_element.text.strip(),
-                                "summary": title_element.text.strip(),
-                                "url": url_element.get_attribute('href'),
-                                "relation_type": "issue_in_epic"
-                            })
-                    except Exception as row_error:
-                        logger.warning(f"Konnte eine Zeile im 'Issues in epic'-Panel nicht parsen: {row_error}")
-        except TimeoutException:
-            # Normalfall für Issues, die keine Epics sind. Kein Fehler.
-            logger.info("Abschnitt 'Issues in epic' nicht gefunden oder nicht rechtzeitig geladen.")
-        except Exception as e:
-            logger.info(f"Ein unerwarteter Fehler ist bei der Extraktion von 'Issues in epic' aufgetreten")
-
-        return data
+        for comp_link in _XP_COMPONENT_LINKS(tree):
+            component_code = comp_link.text_content().strip()
+            if component_code: data["components"].append({"code": component_code, "title": comp_link.get("title")})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s Components gefunden: %s", len(data['components']), ', '.join(comp['code'] for comp in data['components']))
+
+        # "is realized by"-Links und Child-Issue-Zeilen in einem einzigen Baumdurchlauf
+        # holen und anhand des Tags (<a> bzw. <tr>) aufteilen
+        link_elements, child_rows = [], []
+        for node in _XP_RELATED_NODES(tree):
+            (child_rows if node.tag == "tr" else link_elements).append(node)
+
+        # 1. "is realized by" Links direkt zu 'issue_links' hinzufügen
+        for link in link_elements:
+            link_text = link.text_content().strip()
+            issue_key_attr = (link.get("data-issue-key") or link_text).replace('\u200b', '')
+
+            # Optional: Summary-Text aus dem umgebenden link-content-Block
+            summaries = _XP_LINK_SUMMARY(link)
+            summary_text = summaries[0].text_content().strip() if summaries else ""
+
+            link_item = {
+                "key": issue_key_attr,
+                "title": link_text,
+                "summary": summary_text,
+                "url": _absolute_href(link),
+                "relation_type": "realized_by"  # Beziehungstyp direkt hier setzen
+            }
+
+            # Nur hinzufügen, wenn der Key noch nicht in der Zielliste ist
+            if issue_key_attr not in seen_keys:
+                seen_keys.add(issue_key_attr)
+                data["issue_links"].append(link_item)
+
+        if link_elements:
+            logger.info("%s 'is realized by' Links zu 'issue_links' hinzugefügt.", len(link_elements))
+
+        # 2. Child Issues direkt zu 'issue_links' hinzufügen (nach den "realized by"-Links,
+        # damit bei doppelten Keys weiterhin "realized_by" gewinnt)
+        child_issues = DataExtractor._find_child_issues(child_rows)
+        initial_link_count = len(data["issue_links"])
+
+        for child in child_issues:
+            # Prüfen, ob das Child Issue bereits in der Zielliste ist
+            if child["key"] not in seen_keys:
+                seen_keys.add(child["key"])
+                child["relation_type"] = "child"  # Beziehungstyp setzen
+                data["issue_links"].append(child)
+
+        added_children = len(data["issue_links"]) - initial_link_count
+        if added_children > 0:
+            logger.info("%s Child Issues zu 'issue_links' hinzugefügt.", added_children)
 
 
     def extract_activity_details(self, html_content):
@@ -570,10 +699,10 @@ class DataExtractor:
         Feldern wie 'Epic Link' standardisiert. Dies gewährleistet saubere und
         konsistente Ausgabedaten für die weitere Analyse.
         """
-        soup = BeautifulSoup(html_content, 'lxml')
-        action_containers = soup.find_all('div', class_='actionContainer')
+        action_containers = _iter_action_containers(html_content)
 
-        extracted_data = []
+        # Spaltenweise sammeln (ein Array pro Feld); Dicts entstehen erst am Ende
+        users, fields, old_values, new_values, timestamps = [], [], [], [], []
         ignored_fields = ['Checklists', 'Remote Link', 'Link', 'Kommentar oder Erstellung']
 
         for container in action_containers:
@@ -581,72 +710,79 @@ class DataExtractor:
             user_name = "N/A"
             timestamp_iso = "N/A"
 
-            details_block = container.find('div', class_='action-details')
-            if not details_block:
+            details_blocks = _XP_ACTION_DETAILS(container)
+            if not details_blocks:
                 continue
+            details_block = details_blocks[0]
 
-            user_tag = details_block.find('a', class_='user-hover')
-            if user_tag:
-                user_name = user_tag.get_text(strip=True)
+            user_tags = _XP_USER_HOVER(details_block)
+            if user_tags:
+                user_name = _joined_text(user_tags[0])
 
-            time_tag = details_block.find('time', class_='livestamp')
-            if time_tag:
-                timestamp_iso = time_tag.get('datetime', 'N/A')
+            time_tags = _XP_LIVESTAMP(details_block)
+            if time_tags:
+                timestamp_iso = time_tags[0].get('datetime', 'N/A')
 
-            body_block = container.find('div', class_='action-body')
-            if body_block:
+            body_blocks = _XP_ACTION_BODY(container)
+            if body_blocks:
                 # NEUE LOGIK: Finde alle Zeilen (tr) mit Änderungen
-                change_rows = body_block.find_all('tr')
+                change_rows = body_blocks[0].iter('tr')
                 for row in change_rows:
-                    activity_name_tag = row.find('td', class_='activity-name')
-                    if not activity_name_tag:
+                    name_cell, old_cell, new_cell = _activity_cells(row)
+                    if name_cell is None:
                         continue
 
-                    activity_name = activity_name_tag.get_text(strip=True)
+                    activity_name = _joined_text(name_cell)
                     if activity_name in ignored_fields:
                         continue
 
                     # Roh-Werte extrahieren, um sie sauber verarbeiten zu können
-                    old_value_raw = row.find('td', class_='activity-old-val').get_text(strip=True) if row.find('td', class_='activity-old-val') else ""
-                    new_value_raw = row.find('td', class_='activity-new-val').get_text(strip=True) if row.find('td', class_='activity-new-val') else ""
+                    old_value_raw = _joined_text(old_cell) if old_cell is not None else ""
+                    new_value_raw = _joined_text(new_cell) if new_cell is not None else ""
 
                     old_value, new_value = old_value_raw, new_value_raw
 
                     # START DER ÄNDERUNG: Zentralisierte und erweiterte Verarbeitungslogik
                     if activity_name in ['Epic Child', 'Epic Link']:
-                        old_match = re.search(r'([A-Z]+-\d+)', old_value_raw)
-                        old_value = old_match.group(1) if old_match else old_value_raw
-                        new_match = re.search(r'([A-Z]+-\d+)', new_value_raw)
-                        new_value = new_match.group(1) if new_match else new_value_raw
+                        old_value = _extract_key(old_value_raw) or old_value_raw
+                        new_value = _extract_key(new_value_raw) or new_value_raw
 
                     elif activity_name in ['Status', 'Sprint', 'Fix Version/s']:
-                        # Bereinigt Werte wie "Prefix:Value[...id...]" zu "Value" für alte und neue Werte
-                        if old_value_raw:
-                            old_value = old_value_raw.split(':')[-1].split('[')[0].strip()
-                        if new_value_raw:
-                            new_value = new_value_raw.split(':')[-1].split('[')[0].strip()
-
-                        # Für Status, den Wert zusätzlich in Großbuchstaben umwandeln
+                        # Bereinigt alte und neue Werte; Status zusätzlich in Großbuchstaben
                         if activity_name == 'Status':
-                            old_value = old_value.upper()
-                            new_value = new_value.upper()
+                            old_value = _clean(old_value_raw).upper()
+                            new_value = _clean(new_value_raw).upper()
+                        else:
+                            old_value = _clean(old_value_raw)
+                            new_value = _clean(new_value_raw)
 
-                    elif activity_name == 'Fix Version/s':
-                        match = re.search(r'(Q\d_\d{2})', new_value_raw)
-                        new_value = match.group(1) if match else new_value_raw
+                        # Für Fix Versions nur das Quartalskürzel übernehmen, falls vorhanden
+                        if activity_name == 'Fix Version/s':
+                            new_value = _find_quarter(new_value_raw) or new_value
 
                     elif activity_name in ['Acceptance Criteria', 'Description']:
                         new_value = '[...]' if new_value_raw else ''
                     # ENDE DER ÄNDERUNG
 
-                    # Erstelle für jede einzelne Änderung einen eigenen Eintrag
-                    extracted_data.append({
-                        'benutzer': user_name,
-                        'feld_name': activity_name,
-                        'alter_wert': old_value,
-                        'neuer_wert': new_value,
-                        'zeitstempel_iso': timestamp_iso
-                    })
-
-        # Die finale Liste wird wie gewohnt umgedreht, um chronologisch zu sein
-        return extracted_data[::-1]
+                    # Jede einzelne Änderung wird ein eigener Eintrag
+                    users.append(user_name)
+                    fields.append(activity_name)
+                    old_values.append(old_value)
+                    new_values.append(new_value)
+                    timestamps.append(timestamp_iso)
+
+        extracted_data = [
+            {
+                'benutzer': user,
+                'feld_name': field,
+                'alter_wert': old_value,
+                'neuer_wert': new_value,
+                'zeitstempel_iso': timestamp
+            }
+            for user, field, old_value, new_value, timestamp
+            in zip(users, fields, old_values, new_values, timestamps)
+        ]
+
+        # Die finale Liste wird wie gewohnt umgedreht (in-place), um chronologisch zu sein
+        extracted_data.reverse()
+        return extracted_data
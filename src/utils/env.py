@@ -0,0 +1,20 @@
+# src/utils/env.py
+import os
+from dotenv import load_dotenv, find_dotenv
+
+_loaded = False
+
+
+def ensure_env():
+    """
+    Lädt die .env-Datei genau einmal pro Prozess.
+
+    find_dotenv() durchsucht alle Elternverzeichnisse; weitere Aufrufe aus
+    anderen Modulen kehren daher sofort zurück. Ist DOTENV_PATH gesetzt,
+    wird diese Datei direkt geladen.
+    """
+    global _loaded
+    if _loaded:
+        return
+    load_dotenv(os.environ.get("DOTENV_PATH") or find_dotenv())
+    _loaded = True
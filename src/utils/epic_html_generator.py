@@ -19,29 +19,75 @@ Key features:
 """
 
 import os
-import base64
+import asyncio
+import time
+import mmap
+import binascii
+import functools
 import re
-import mimetypes
 from pathlib import Path
 import json
+import orjson
 from utils.logger_config import logger
-from typing import Dict, Tuple, Optional
-from openai import OpenAI
-from dotenv import load_dotenv
+from typing import Dict, List, Tuple, Optional
+from openai import OpenAI, AsyncOpenAI
+from utils.env import ensure_env
 from utils.prompt_loader import load_prompt_template
+from utils.rate_limiter import get_limiter, estimate_tokens
 from utils.config import EPIC_HTML_TEMPLATE, HTML_REPORTS_DIR, ISSUE_TREES_DIR, PLOT_DIR
 
+# <img>-Tags mit lokalem oder externem src-Attribut
+_IMG_RE = re.compile(r'<img\s+[^>]*src=["\']([^"\']+)["\'][^>]*>')
+
+# MIME-Typen der Bildformate, die in den Reports vorkommen (Fallback: PNG)
+_MIME = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.svg': 'image/svg+xml',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+}
+
+# HTML-Dokument in der LLM-Antwort
+_HTML_RE = re.compile(r'(?:<!DOCTYPE html>|<html[\s>]).*?</html>', re.IGNORECASE | re.DOTALL)
+
+
+@functools.lru_cache(maxsize=512)
+def _encode_image(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Liest ein Bild und liefert es Base64-kodiert. Der Cache ist über
+    mtime_ns und size an die Dateiversion gebunden, sodass gemeinsam genutzte
+    Plots und Issue-Trees über mehrere Epics hinweg nur einmal kodiert werden.
+    Die Datei wird per mmap direkt an binascii übergeben, ohne Zwischenkopie
+    der Rohdaten.
+    """
+    if size == 0:
+        return ""
+    with open(path, 'rb') as img_file, mmap.mmap(img_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return binascii.b2a_base64(mm, newline=False).decode('ascii')
+
+
 class EpicHtmlGenerator:
     """
     Klasse zur Generierung von HTML-Dateien für Business Epics mit Unterstützung
     für Template-basierte Generierung, LLM-Integration und Bild-Einbettung.
     """
 
+    # Abfrageintervall für den Status eines Batch-API-Jobs (Sekunden)
+    BATCH_POLL_SECONDS = 30
+
+    # Verzeichnisse, in denen nach Bildern gesucht wird (in dieser Reihenfolge)
+    SEARCH_DIRS = (ISSUE_TREES_DIR, PLOT_DIR)
+
     def __init__(self,
                  template_path: str = EPIC_HTML_TEMPLATE,
                  model: str = "gpt-4.1-mini",
                  output_dir: Optional[str] = HTML_REPORTS_DIR,
-                 token_tracker=None):
+                 token_tracker=None,
+                 batch_size: int = 4,
+                 use_batch_api: bool = False,
+                 max_concurrency: int = 4):
         """
         Initialisiert den HTML-Generator mit dem angegebenen Template und LLM-Modell.
 
@@ -49,21 +95,36 @@ class EpicHtmlGenerator:
             template_path: Pfad zur HTML-Vorlagendatei
             model: Name des zu verwendenden LLM-Modells
             output_dir: Optionales Ausgabeverzeichnis für HTML-Dateien
+            batch_size: Anzahl Epics pro LLM-Aufruf in `process_multiple_epics`
+            use_batch_api: Epics in `process_multiple_epics` asynchron über die
+                OpenAI Batch API generieren (günstiger, aber mit Wartezeit)
+            max_concurrency: Maximale Zahl paralleler LLM-Requests in
+                `process_multiple_epics`
         """
         # Umgebungsvariablen aus .env-Datei laden
-        load_dotenv()
+        ensure_env()
 
         self.template_path = template_path
         self.client = OpenAI()
         self.model = model
         self.output_dir = output_dir
+        # Ausgabeverzeichnis einmal anlegen statt bei jedem Epic
+        self._out = Path(output_dir) if output_dir is not None else None
+        if self._out is not None:
+            self._out.mkdir(parents=True, exist_ok=True)
         self.template_html = self._load_template()
         self.token_tracker = token_tracker
         self.prompt_template = load_prompt_template("html_generator_prompt.yaml", "user_prompt_template")
-
-        # Mimetypes initialisieren
-        if not mimetypes.inited:
-            mimetypes.init()
+        # Statischer System-Prompt (Template + Anweisungen) wird einmal gerendert und
+        # bleibt über alle Aufrufe byte-identisch -> Prompt-Caching beim Provider
+        self._system_prompt = load_prompt_template("html_generator_prompt.yaml", "system_prompt_template").format(
+            template_html=self.template_html
+        )
+        self._image_index: Optional[Dict[str, str]] = None
+        self.batch_instructions = load_prompt_template("html_generator_prompt.yaml", "batch_output_instructions")
+        self.batch_size = max(1, batch_size)
+        self.use_batch_api = use_batch_api
+        self.max_concurrency = max(1, max_concurrency)
 
     def _load_template(self) -> str:
         """
@@ -91,86 +152,133 @@ class EpicHtmlGenerator:
         Returns:
             Extrahierter HTML-Inhalt
         """
-        # Nach HTML-Inhalt zwischen <!DOCTYPE html> und </html> suchen
-        start_index = response.find('<!DOCTYPE html>')
-        end_index = response.find('</html>')
+        # Ein Durchlauf: ab <!DOCTYPE html> bzw. <html ...> bis zum ersten </html>.
+        # <html[\s>] schließt den Wrapper-Tag <html_output> aus.
+        match = _HTML_RE.search(response)
+        if match:
+            return match.group(0)
 
-        if start_index != -1 and end_index != -1:
-            return response[start_index:end_index + 7]  # +7 für '</html>'
+        # Wenn nichts gefunden wurde, vollständige Antwort zurückgeben
+        return response
 
-        # Wenn nicht gefunden, nach Inhalt zwischen <html> und </html> suchen
-        start_index = response.find('<html')
-        end_index = response.find('</html>')
+    def invalidate_index(self):
+        """Verwirft den Bild-Index; er wird beim nächsten Zugriff neu aufgebaut."""
+        self._image_index = None
 
-        if start_index != -1 and end_index != -1:
-            return response[start_index:end_index + 7]
+    def _build_image_index(self) -> Dict[str, str]:
+        """Listet die Bildverzeichnisse einmal auf und baut einen Index Dateiname -> Pfad."""
+        index = {}
+        for search_dir in self.SEARCH_DIRS:
+            try:
+                with os.scandir(search_dir) as entries:
+                    for entry in entries:
+                        # Frühere Verzeichnisse haben Vorrang
+                        index.setdefault(entry.name, entry.path)
+            except FileNotFoundError:
+                continue
+        self._image_index = index
+        return index
 
-        # Wenn nichts gefunden wurde, vollständige Antwort zurückgeben
-        return response
+    def _find_image(self, filename: str) -> Optional[str]:
+        """
+        Sucht ein Bild über den Index der Bildverzeichnisse.
+
+        Plots und Issue-Trees entstehen während eines Laufs laufend neu; bei
+        einem Fehltreffer wird der Index deshalb einmal neu aufgebaut, bevor
+        das Bild als nicht vorhanden gilt.
+        """
+        index = self._image_index if self._image_index is not None else self._build_image_index()
+        found_path = index.get(filename)
+        if found_path is None:
+            found_path = self._build_image_index().get(filename)
+        if found_path:
+            logger.info(f"Bild '{filename}' gefunden in '{os.path.dirname(found_path)}'")
+        return found_path
 
     def _embed_images_in_html(self, html_content: str, BE_key: str) -> str:
         """
         Bettet alle lokalen Bilder aus vordefinierten Verzeichnissen direkt
         als Base64 in den HTML-Inhalt ein.
-        """
-        # NEU: Liste der Verzeichnisse, in denen nach Bildern gesucht werden soll
-        SEARCH_DIRS = [ISSUE_TREES_DIR, PLOT_DIR]
 
-        # Finde alle Bild-Tags im HTML
-        img_pattern = re.compile(r'<img\s+[^>]*src=["\']([^"\']+)["\'][^>]*>')
-
-        # finditer() wird verwendet, um eine veränderbare Kopie für die Iteration zu erstellen
-        for match in list(img_pattern.finditer(html_content)):
+        Alle <img>-Tags werden in einem einzigen Durchlauf über das HTML
+        ersetzt (`re.sub` mit Callback) statt mit einem `str.replace` pro Bild.
+        """
+        def _replace_img(match):
             img_tag = match.group(0)
             img_src = match.group(1)
 
             # Überspringe bereits eingebettete oder externe Bilder
-            if img_src.startswith('data:') or img_src.startswith('http'):
-                continue
+            if img_src.startswith(('data:', 'http')):
+                return img_tag
 
-            # GEÄNDERT: Verallgemeinerte Logik zur Dateisuche
-            found_path = None
             filename = os.path.basename(img_src) # Isoliert den Dateinamen
+            found_path = self._find_image(filename)
 
-            for search_dir in SEARCH_DIRS:
-                potential_path = os.path.join(search_dir, filename)
-                if os.path.exists(potential_path):
-                    found_path = potential_path
-                    logger.info(f"Bild '{filename}' gefunden in '{search_dir}'")
-                    break # Stoppe die Suche, sobald die Datei gefunden wurde
-
-            # Wenn die Bilddatei in einem der Verzeichnisse gefunden wurde...
-            if found_path:
-                try:
-                    # Bild-MIME-Typ ermitteln
-                    mime_type, _ = mimetypes.guess_type(found_path)
-                    if not mime_type:
-                        mime_type = 'image/png'  # Standard-Fallback
-
-                    # Bild lesen und als Base64 kodieren
-                    with open(found_path, 'rb') as img_file:
-                        img_data = img_file.read()
-                        img_base64 = base64.b64encode(img_data).decode('utf-8')
-
-                    # Data-URI erstellen
-                    data_uri = f'data:{mime_type};base64,{img_base64}'
-
-                    # Ersetze das src-Attribut im img-Tag
-                    new_img_tag = img_tag.replace(img_src, data_uri)
-                    html_content = html_content.replace(img_tag, new_img_tag)
-
-                    logger.info(f"Bild erfolgreich eingebettet: {filename}")
-                except Exception as e:
-                    logger.error(f"Fehler bei der Verarbeitung des Bildes {filename}: {str(e)}")
-            else:
-                # Wenn die Bilddatei nicht gefunden wurde, ersetze den Tag durch Text
+            # Wenn die Bilddatei nicht gefunden wurde, ersetze den Tag durch Text
+            if not found_path:
                 logger.warning(f"Bilddatei '{filename}' nicht gefunden. Ersetze durch Text.")
-                replacement_text = f"<p style='color: #6c757d; font-style: italic;'>Grafik '{filename}' nicht verfügbar</p>"
-                html_content = html_content.replace(img_tag, replacement_text)
+                return f"<p style='color: #6c757d; font-style: italic;'>Grafik '{filename}' nicht verfügbar</p>"
 
+            try:
+                # Bild-MIME-Typ über die Dateiendung ermitteln
+                mime_type = _MIME.get(os.path.splitext(found_path)[1].lower(), 'image/png')
+
+                # Bild als Base64 kodieren; gecacht pro Pfad und Dateiversion
+                st = os.stat(found_path)
+                img_base64 = _encode_image(found_path, st.st_mtime_ns, st.st_size)
+
+                # Ersetze das src-Attribut im img-Tag durch die Data-URI; die
+                # Teile werden einmal zusammengefügt statt den Tag erneut zu durchsuchen
+                src_start = match.start(1) - match.start(0)
+                src_end = match.end(1) - match.start(0)
+                logger.info(f"Bild erfolgreich eingebettet: {filename}")
+                return ''.join((img_tag[:src_start], 'data:', mime_type, ';base64,', img_base64, img_tag[src_end:]))
+            except Exception as e:
+                logger.error(f"Fehler bei der Verarbeitung des Bildes {filename}: {str(e)}")
+                return img_tag
+
+        return _IMG_RE.sub(_replace_img, html_content)
+
+    def _build_messages(self, complete_epic_data, extra_instructions: str = "") -> list:
+        """
+        Baut die Chat-Nachrichten: statischer System-Prompt plus User-Nachricht
+        mit den Epic-Daten (und ggf. zusätzlichen Anweisungen).
+        """
+        # WICHTIG: Das 'complete_epic_data'-Dictionary muss in einen JSON-String
+        # umgewandelt werden, bevor es in den Prompt eingefügt wird.
+        data_as_json_string = orjson.dumps(
+            complete_epic_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+        user_prompt = self.prompt_template.format(complete_epic_data=data_as_json_string) + extra_instructions
+        return [
+            {"role": "system", "content": self._system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    @staticmethod
+    def _estimate_message_tokens(messages: list) -> int:
+        return estimate_tokens("".join(m["content"] for m in messages))
+
+    def _ensure_parent_dir(self, output_file) -> None:
+        """Legt das Zielverzeichnis an, sofern es nicht das bereits angelegte Ausgabeverzeichnis ist."""
+        parent = Path(output_file).parent
+        if parent != self._out:
+            parent.mkdir(parents=True, exist_ok=True)
+
+    def _write_html(self, response_content: str, BE_key: str, output_file: str) -> str:
+        """Extrahiert das HTML aus der LLM-Antwort, bettet die Bilder ein und schreibt die Datei."""
+        html_content = self._extract_html(response_content)
+        html_content = self._embed_images_in_html(html_content, BE_key)
+
+        # Einmal kodieren und als Bytes schreiben, ohne die Text-Schicht
+        with open(output_file, 'wb') as file:
+            file.write(html_content.encode('utf-8'))
+
+        logger.info(f"HTML-Summary erfolgreich erstellt für {BE_key} unter {output_file}")
         return html_content
 
-    def generate_epic_html(self, complete_epic_data: dict, BE_key: str, output_file: Optional[str] = None):
+    def generate_epic_html(self, complete_epic_data: dict, BE_key: str,
+                           output_file: Optional[str] = None) -> Tuple[str, Dict[str, int]]:
         """
         Generiert eine HTML-Datei aus dem vollständigen, fusionierten Datenobjekt.
 
@@ -178,54 +286,42 @@ class EpicHtmlGenerator:
             complete_epic_data: Das umfassende Dictionary mit allen Analyse- und Inhaltsdaten.
             BE_key: Business Epic Key (z.B. "BEMABU-1825")
             output_file: Optionaler Dateipfad für die Ausgabe-HTML-Datei
+
+        Returns:
+            Tuple (HTML-Inhalt, Token-Nutzung)
         """
         if output_file is None:
-            if self.output_dir is None:
+            if self._out is None:
                 raise ValueError("Entweder output_file oder output_dir muss angegeben werden")
-            output_file = os.path.join(self.output_dir, f"{BE_key}_summary.html")
+            output_file = self._out / f"{BE_key}_summary.html"
+        else:
+            self._ensure_parent_dir(output_file)
 
-        output_dir = os.path.dirname(output_file)
-        os.makedirs(output_dir, exist_ok=True)
-
-        # WICHTIG: Das 'complete_epic_data'-Dictionary muss in einen JSON-String
-        # umgewandelt werden, bevor es in den Prompt eingefügt wird.
-        data_as_json_string = json.dumps(complete_epic_data, indent=2, ensure_ascii=False)
-
-        prompt = self.prompt_template.format(
-            template_html=self.template_html,
-            complete_epic_data=data_as_json_string
-        )
+        messages = self._build_messages(complete_epic_data)
 
         logger.info(f"Starte HTML-Generierung mit Model '{self.model}' für {BE_key}")
 
         try:
-            response = self.client.chat.completions.create(
+            response = get_limiter(self.model).call(
+                self.client.chat.completions.create,
+                self._estimate_message_tokens(messages),
                 model=self.model,
-                messages=[{
-                    "role": "user",
-                    "content": prompt}],
+                messages=messages,
                 temperature=0,
                 max_tokens=6000
             )
             response_content = response.choices[0].message.content
 
+            token_usage = {
+                "input_tokens": response.usage.prompt_tokens,
+                "output_tokens": response.usage.completion_tokens,
+                "total_tokens": response.usage.total_tokens,
+            }
             if self.token_tracker:
-                self.token_tracker.log_usage(
-                    model=self.model,
-                    input_tokens=response.usage.prompt_tokens,
-                    output_tokens=response.usage.completion_tokens,
-                    total_tokens=response.usage.total_tokens,
-                    task_name=f"html_generation",
-                )
-
-            html_content = self._extract_html(response_content)
-            html_content = self._embed_images_in_html(html_content, BE_key)
+                self.token_tracker.log_usage(model=self.model, task_name="html_generation", **token_usage)
 
-            with open(output_file, 'w', encoding='utf-8') as file:
-                file.write(html_content)
-
-            logger.info(f"HTML-Summary erfolgreich erstellt für {BE_key} unter {output_file}")
-            return html_content
+            html_content = self._write_html(response_content, BE_key, output_file)
+            return html_content, token_usage
 
         except Exception as e:
             # Fügen Sie mehr Details zur Fehlermeldung hinzu
@@ -233,16 +329,190 @@ class EpicHtmlGenerator:
             raise Exception(f"Fehler bei der HTML-Verarbeitung für {BE_key}: {e}")
 
 
+    def _build_batch_request(self, epics: Dict[str, dict]) -> Tuple[int, dict]:
+        """Liefert geschätzte Tokens und Request-Parameter für einen Batch-Aufruf mit mehreren Epics."""
+        messages = self._build_messages(epics, self.batch_instructions)
+
+        request = dict(
+            model=self.model,
+            messages=messages,
+            temperature=0,
+            max_tokens=6000 * len(epics),
+            response_format={"type": "json_object"}
+        )
+        return self._estimate_message_tokens(messages), request
+
+    def _handle_batch_response(self, response, epics: Dict[str, dict],
+                               output_files: Dict[str, str]) -> Tuple[Dict[str, int], List[str]]:
+        """
+        Protokolliert die Token-Nutzung und schreibt die HTML-Dateien aus einer Batch-Antwort.
+
+        Returns:
+            Tuple (Token-Nutzung des Aufrufs, Keys der tatsächlich geschriebenen Epics)
+        """
+        token_usage = {
+            "input_tokens": response.usage.prompt_tokens,
+            "output_tokens": response.usage.completion_tokens,
+            "total_tokens": response.usage.total_tokens,
+        }
+        if self.token_tracker:
+            self.token_tracker.log_usage(model=self.model, task_name="html_generation_batch", **token_usage)
+
+        html_by_key = json.loads(response.choices[0].message.content)
+
+        written_keys = []
+        for be_key in epics:
+            html_content = html_by_key.get(be_key)
+            if not html_content:
+                logger.error(f"Batch-Antwort enthält kein HTML für {be_key}")
+                continue
+            self._ensure_parent_dir(output_files[be_key])
+            self._write_html(html_content, be_key, output_files[be_key])
+            written_keys.append(be_key)
+
+        return token_usage, written_keys
+
+    def generate_epic_html_batch(self, epics: Dict[str, dict],
+                                 output_files: Dict[str, str]) -> Tuple[Dict[str, int], List[str]]:
+        """
+        Generiert die HTML-Dateien mehrerer Business Epics mit einem einzigen LLM-Aufruf.
+
+        Template und Anweisungen werden nur einmal gesendet, gefolgt von den
+        Daten aller Epics. Das Modell liefert ein JSON-Objekt {BE_key: html}
+        zurück, das anschließend pro Epic wie in `generate_epic_html`
+        nachbearbeitet und gespeichert wird.
+
+        Args:
+            epics: Dictionary {BE_key: complete_epic_data}
+            output_files: Dictionary {BE_key: Ausgabepfad}
+
+        Returns:
+            Tuple (Token-Nutzung des Batch-Aufrufs, Keys der geschriebenen Epics)
+        """
+        estimated_tokens, request = self._build_batch_request(epics)
+        logger.info(f"Starte Batch-HTML-Generierung mit Model '{self.model}' für {', '.join(epics)}")
+
+        response = get_limiter(self.model).call(
+            self.client.chat.completions.create,
+            estimated_tokens,
+            **request
+        )
+        return self._handle_batch_response(response, epics, output_files)
+
+    async def agenerate_epic_html_batch(self, async_client: AsyncOpenAI, epics: Dict[str, dict],
+                                        output_files: Dict[str, str],
+                                        semaphore: asyncio.Semaphore) -> Tuple[Dict[str, int], List[str]]:
+        """
+        Async-Variante von `generate_epic_html_batch` für die parallele
+        Verarbeitung mehrerer Batches. Der Semaphor begrenzt die Zahl
+        gleichzeitiger Requests, der Rate-Limiter wird mit den synchronen
+        Aufrufen geteilt.
+        """
+        estimated_tokens, request = self._build_batch_request(epics)
+        limiter = get_limiter(self.model)
+
+        async with semaphore:
+            logger.info(f"Starte Batch-HTML-Generierung mit Model '{self.model}' für {', '.join(epics)}")
+            entry = await asyncio.to_thread(limiter.acquire, estimated_tokens)
+            response = await async_client.chat.completions.create(**request)
+            if getattr(response, "usage", None):
+                limiter.reconcile(entry, response.usage.total_tokens)
+
+        # Bild-Einbettung und Schreiben sind Datei-I/O und laufen außerhalb der Event-Loop
+        return await asyncio.to_thread(self._handle_batch_response, response, epics, output_files)
+
+    def generate_epic_html_batch_api(self, epics: Dict[str, dict], output_files: Dict[str, str]) -> Dict[str, Dict[str, int]]:
+        """
+        Generiert die HTML-Dateien mehrerer Business Epics über die OpenAI Batch API.
+
+        Pro Epic wird eine Zeile mit dem regulären Einzel-Prompt in eine
+        JSONL-Datei geschrieben, hochgeladen und als Batch gestartet. Danach
+        wird bis zum Abschluss gepollt und jedes Ergebnis wie in
+        `generate_epic_html` nachbearbeitet und gespeichert.
+
+        Args:
+            epics: Dictionary {BE_key: complete_epic_data}
+            output_files: Dictionary {BE_key: Ausgabepfad}
+
+        Returns:
+            Dictionary mit Token-Nutzung pro Business Epic
+        """
+        lines = []
+        for be_key, complete_epic_data in epics.items():
+            lines.append(json.dumps({
+                "custom_id": be_key,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": self._build_messages(complete_epic_data),
+                    "temperature": 0,
+                    "max_tokens": 6000,
+                },
+            }, ensure_ascii=False))
+
+        batch_input = self.client.files.create(
+            file=("epic_html_batch.jsonl", "\n".join(lines).encode('utf-8')),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Batch {batch.id} mit {len(lines)} Business Epics gestartet")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(self.BATCH_POLL_SECONDS)
+            batch = self.client.batches.retrieve(batch.id)
+            logger.info(f"Batch {batch.id}: Status '{batch.status}'")
+
+        if batch.status != "completed" or not batch.output_file_id:
+            raise Exception(f"Batch {batch.id} endete mit Status '{batch.status}'")
+
+        token_usage_results = {}
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            be_key = result["custom_id"]
+            body = (result.get("response") or {}).get("body") or {}
+            if result.get("error") or not body.get("choices"):
+                logger.error(f"Batch-Ergebnis für {be_key} fehlerhaft: {result.get('error')}")
+                continue
+
+            usage = body.get("usage", {})
+            token_usage = {
+                "input_tokens": usage.get("prompt_tokens", 0),
+                "output_tokens": usage.get("completion_tokens", 0),
+                "total_tokens": usage.get("total_tokens", 0),
+            }
+            if self.token_tracker:
+                self.token_tracker.log_usage(model=self.model, task_name="html_generation_batch_api",
+                                             entity_id=be_key, **token_usage)
+            token_usage_results[be_key] = token_usage
+
+            self._ensure_parent_dir(output_files[be_key])
+            self._write_html(body["choices"][0]["message"]["content"], be_key, output_files[be_key])
+
+        return token_usage_results
+
     def process_multiple_epics(self, be_file_path: str, json_dir: str = '../output') -> Dict[str, Dict[str, int]]:
         """
         Verarbeitet mehrere Business Epics aus einer Datei.
 
+        Die Epics werden in Gruppen von `batch_size` mit je einem LLM-Aufruf
+        generiert; bis zu `max_concurrency` Gruppen laufen parallel (siehe
+        `agenerate_epic_html_batch`). Mit `use_batch_api=True` laufen alle
+        Epics stattdessen gesammelt über die OpenAI Batch API.
+
         Args:
             be_file_path: Pfad zur Datei mit Business Epic Keys
             json_dir: Verzeichnis mit den JSON-Zusammenfassungen
 
         Returns:
-            Dictionary mit Token-Nutzung pro Business Epic
+            Dictionary mit Token-Nutzung pro Business Epic (bei Batches die
+            gemeinsame Nutzung des jeweiligen Aufrufs)
         """
         token_usage_results = {}
 
@@ -259,27 +529,57 @@ class EpicHtmlGenerator:
             print(f"Fehler beim Lesen der Business Epic Keys Datei: {e}")
             return token_usage_results
 
-        # Jeden Business Epic Key verarbeiten
+        # Eingabedateien lesen
+        epics = {}
         for be_key in be_keys:
-            print(f"Verarbeite Business Epic: {be_key}")
-
-            # Eingabedatei lesen
             try:
                 with open(f"{json_dir}/{be_key}_json_summary.json", 'r', encoding='utf-8') as file:
-                    issue_content = file.read()
+                    epics[be_key] = json.load(file)
             except Exception as e:
                 print(f"Fehler beim Lesen der Eingabedatei für {be_key}: {e}")
-                continue
 
-            # HTML generieren und speichern
-            output_file = os.path.join(json_dir, f"{be_key}_summary.html") if self.output_dir is None else os.path.join(self.output_dir, f"{be_key}_summary.html")
+        target_dir = json_dir if self.output_dir is None else self.output_dir
+        keys = list(epics)
 
+        if self.use_batch_api:
+            output_files = {k: os.path.join(target_dir, f"{k}_summary.html") for k in keys}
             try:
-                _, token_usage = self.generate_epic_html(issue_content, be_key, output_file)
-                token_usage_results[be_key] = token_usage
-                print(f"HTML-Datei erfolgreich erstellt bei {output_file}")
+                return self.generate_epic_html_batch_api(epics, output_files)
             except Exception as e:
-                print(f"Fehler bei der HTML-Generierung für {be_key}: {e}")
+                print(f"Fehler bei der HTML-Generierung über die Batch API: {e}")
+                return token_usage_results
+
+        # Business Epics gruppenweise und die Gruppen parallel verarbeiten
+        batches = [keys[i:i + self.batch_size] for i in range(0, len(keys), self.batch_size)]
+
+        async def _run():
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            async_client = AsyncOpenAI()
+            try:
+                return await asyncio.gather(*[
+                    self.agenerate_epic_html_batch(
+                        async_client,
+                        {k: epics[k] for k in batch_keys},
+                        {k: os.path.join(target_dir, f"{k}_summary.html") for k in batch_keys},
+                        semaphore
+                    ) for batch_keys in batches
+                ], return_exceptions=True)
+            finally:
+                # Der Async-Client ist an diese Event-Loop gebunden
+                await async_client.close()
+
+        for batch_keys, result in zip(batches, asyncio.run(_run())):
+            if isinstance(result, Exception):
+                print(f"Fehler bei der HTML-Generierung für {', '.join(batch_keys)}: {result}")
+                continue
+            token_usage, written_keys = result
+            for be_key in written_keys:
+                token_usage_results[be_key] = token_usage
+            if written_keys:
+                print(f"HTML-Dateien erfolgreich erstellt für {', '.join(written_keys)} in {target_dir}")
+            missing_keys = [k for k in batch_keys if k not in written_keys]
+            if missing_keys:
+                print(f"Keine HTML-Datei erstellt für {', '.join(missing_keys)} (fehlt in der Batch-Antwort)")
 
         return token_usage_results
 
@@ -294,13 +594,19 @@ if __name__ == "__main__":
     parser.add_argument('--model', default='gpt-4.1-mini', help='LLM-Modell für die Generierung (Standard: gpt-4.1-mini)')
     parser.add_argument('--output-dir', default='../output', help='Ausgabeverzeichnis für HTML-Dateien (Standard: ../output)')
     parser.add_argument('--template', default='./epic-html_template.html', help='Pfad zur HTML-Vorlage (Standard: ./epic-html_template.html)')
+    parser.add_argument('--batch-size', type=int, default=4, help='Anzahl Epics pro LLM-Aufruf (Standard: 4)')
+    parser.add_argument('--max-concurrency', type=int, default=4, help='Maximale Zahl paralleler LLM-Requests (Standard: 4)')
+    parser.add_argument('--batch-api', action='store_true', help='Epics über die OpenAI Batch API generieren (ca. 50%% günstiger, Ergebnis nach Abschluss des Batches)')
     args = parser.parse_args()
 
     # HTML-Generator initialisieren
     generator = EpicHtmlGenerator(
         template_path=args.template,
         model=args.model,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        batch_size=args.batch_size,
+        use_batch_api=args.batch_api,
+        max_concurrency=args.max_concurrency
     )
 
     # Mehrere Epics verarbeiten
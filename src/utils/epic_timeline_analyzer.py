@@ -42,11 +42,11 @@ Usage:
 """
 import os
 import sys
-import json
+import orjson
 import argparse
 import re
+import functools
 import pandas as pd
-from datetime import datetime
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import warnings
@@ -66,6 +66,12 @@ from utils.jira_tree_classes import JiraTreeGenerator
 from utils.jira_scraper import JiraScraper
 from utils.config import JIRA_ISSUES_DIR, PLOT_DIR, JIRA_EMAIL, LLM_MODEL_BUSINESS_VALUE, SCRAPER_CHECK_DAYS
 
+# JIRA-Key (z.B. BEMABU-2054), einmalig kompiliert
+_KEY_RE = re.compile(r'([A-Z]+-\d+)')
+
+# Status, die ein Issue als abgeschlossen kennzeichnen
+_CLOSED_STATI = frozenset({'CLOSED', 'RESOLVED', 'DONE'})
+
 
 class EpicTimelineAnalyzer:
     """Orchestriert die Analyse der Erstellungs-, Abschluss- und Laufzeit-Timeline eines Epics.
@@ -79,9 +85,11 @@ class EpicTimelineAnalyzer:
         json_dir (str): Der Pfad zum Verzeichnis mit den lokalen JSON-Dateien.
         tree_generator (JiraTreeGenerator): Eine Instanz zur Erstellung der initialen Issue-Hierarchie.
         scraper (JiraScraper | None): Eine optionale, bereits authentifizierte Scraper-Instanz.
+        fetched_keys (set[str]): Bereits in diesem Lauf nachgeladene Issue-Keys.
     """
 
-    def __init__(self, epic_id: str, json_dir: str = JIRA_ISSUES_DIR, scraper: JiraScraper | None = None):
+    def __init__(self, epic_id: str, json_dir: str = JIRA_ISSUES_DIR, scraper: JiraScraper | None = None,
+                 fetched_keys: set[str] | None = None):
         """Initialisiert den Analyzer.
 
         Args:
@@ -89,17 +97,48 @@ class EpicTimelineAnalyzer:
             json_dir (str, optional): Der Pfad zum Verzeichnis der JSON-Dateien.
             scraper (JiraScraper | None, optional): Eine existierende, bereits authentifizierte
                 JiraScraper-Instanz zur Wiederverwendung der Session.
+            fetched_keys (set[str] | None, optional): Ein über mehrere Analyzer geteiltes Set
+                der bereits nachgeladenen Keys; diese werden nicht erneut angefragt.
         """
         self.epic_id = epic_id
         self.json_dir = json_dir
         self.tree_generator = JiraTreeGenerator(json_dir=self.json_dir)
         self.scraper = scraper
+        self.fetched_keys = fetched_keys if fetched_keys is not None else set()
+        # Bereits gelesene Issue-JSONs (Key -> Daten) für beide Durchläufe der Analyse
+        self._issue_cache: dict[str, dict] = {}
         logger.info(f"EpicTimelineAnalyzer für '{self.epic_id}' initialisiert.")
 
-    def _parse_key(self, value_str: str) -> str | None:
+    def _load_issue(self, key: str) -> dict | None:
+        """Liest die lokale JSON-Datei eines Issues, jede Datei höchstens einmal.
+
+        Fehlende oder unlesbare Dateien liefern None und werden nicht gecacht,
+        damit nachgeladene Issues beim nächsten Zugriff gefunden werden. Die
+        Zeitstempel aller Statuswechsel in einen Abschluss-Status werden dabei
+        vorab unter '_status_close_ts' abgelegt.
+        """
+        issue_data = self._issue_cache.get(key)
+        if issue_data is None:
+            file_path = os.path.join(self.json_dir, f"{key}.json")
+            try:
+                with open(file_path, 'rb') as f:
+                    issue_data = orjson.loads(f.read())
+            except (FileNotFoundError, orjson.JSONDecodeError):
+                return None
+            # Abschluss-Zeitpunkte einmal beim Laden bestimmen statt bei jeder Auswertung
+            issue_data['_status_close_ts'] = [
+                act['zeitstempel_iso'] for act in issue_data.get('activities', [])
+                if act.get('feld_name') == 'Status' and self._clean_status_name(act.get('neuer_wert')) in _CLOSED_STATI
+            ]
+            self._issue_cache[key] = issue_data
+        return issue_data
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def _parse_key(value_str: str) -> str | None:
         """Extrahiert einen JIRA-Key aus einem String mithilfe von regulären Ausdrücken."""
         if not value_str: return None
-        match = re.search(r'([A-Z]+-\d+)', value_str)
+        match = _KEY_RE.search(value_str)
         return match.group(1) if match else None
 
     def _clean_status_name(self, raw_name: str) -> str:
@@ -112,6 +151,43 @@ class EpicTimelineAnalyzer:
                 return raw_name.strip().upper()
         return raw_name.strip().upper()
 
+    def _net_add_activities(self, child_activities: list[dict]) -> list[dict]:
+        """Filtert die 'Epic Child'-Aktivitäten auf Netto-Hinzufügungen.
+
+        Die Aktivitäten werden pro (Child-Key, Tag) gruppiert. Eine Gruppe zählt
+        als Hinzufügen, wenn sie mindestens einen neuen Wert und kein Entfernen
+        (alter Wert ohne neuen Wert) enthält; von ihr werden die Aktivitäten mit
+        neuem Wert übernommen. Gruppierung und Prüfung laufen vektorisiert in
+        pandas, die Reihenfolge entspricht der ersten Fundstelle jeder Gruppe.
+
+        Args:
+            child_activities (list[dict]): Die 'Epic Child'-Aktivitäten.
+
+        Returns:
+            list[dict]: Die Aktivitäten, die ein Child-Issue netto hinzufügen.
+        """
+        if not child_activities:
+            return []
+
+        df_acts = pd.DataFrame(child_activities, columns=['alter_wert', 'neuer_wert', 'zeitstempel_iso'])
+        new_values = df_acts['neuer_wert'].fillna('').astype(str)
+        old_values = df_acts['alter_wert'].fillna('').astype(str)
+
+        child_key = new_values.str.extract(_KEY_RE.pattern, expand=False).fillna(
+            old_values.str.extract(_KEY_RE.pattern, expand=False)
+        )
+        groups = pd.DataFrame({
+            'child_key': child_key,
+            'day': df_acts['zeitstempel_iso'].str.slice(0, 10),
+            'is_add': new_values != '',
+            'is_remove': (new_values == '') & (old_values != ''),
+        }).dropna(subset=['child_key'])
+
+        grouped = groups.groupby(['child_key', 'day'], sort=False)
+        net_add = grouped['is_add'].transform('any') & ~grouped['is_remove'].transform('any') & groups['is_add']
+        order = grouped.ngroup()[net_add].sort_values(kind='stable')
+        return [child_activities[i] for i in order.index]
+
     def analyze_timeline(self) -> pd.DataFrame | None:
         """Führt die vollständige Analyse durch, inkl. dynamischer Entdeckung und Nachladen.
 
@@ -134,17 +210,13 @@ class EpicTimelineAnalyzer:
 
         activities_with_source = []
         for key in set(initial_tree.nodes()):
-            file_path = os.path.join(self.json_dir, f"{key}.json")
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    issue_data = json.load(f)
-                    for activity in issue_data.get('activities', []):
-                        # Speichere die Quell-ID zusammen mit der Aktivität
-                        activities_with_source.append((key, activity))
-            except (FileNotFoundError, json.JSONDecodeError):
+            issue_data = self._load_issue(key)
+            if issue_data is None:
                 continue
+            for activity in issue_data.get('activities', []):
+                # Speichere die Quell-ID zusammen mit der Aktivität
+                activities_with_source.append((key, activity))
 
-        from collections import defaultdict
         child_activities = []
         for source_key, act in activities_with_source:
             if act.get('feld_name') == 'Epic Child':
@@ -152,25 +224,27 @@ class EpicTimelineAnalyzer:
                 logger.info(f"'Epic Child' Aktivität in Quell-Issue '{source_key}' identifiziert.")
                 child_activities.append(act)
 
-        daily_activity_groups = defaultdict(list)
-        for act in child_activities:
-            child_key = self._parse_key(act.get('neuer_wert')) or self._parse_key(act.get('alter_wert'))
-            if child_key:
-                daily_activity_groups[(child_key, act['zeitstempel_iso'][:10])].append(act)
-
-        net_add_activities = []
-        for activities in daily_activity_groups.values():
-            if any(act.get('neuer_wert') for act in activities) and not any(not act.get('neuer_wert') and act.get('alter_wert') for act in activities):
-                net_add_activities.extend(act for act in activities if act.get('neuer_wert'))
+        net_add_activities = self._net_add_activities(child_activities)
 
         if not net_add_activities:
             logger.warning(f"Keine Netto-'Hinzufügen'-Aktivitäten für Epic {self.epic_id} gefunden.")
             return None
 
-        required_child_keys = {self._parse_key(act['neuer_wert']) for act in net_add_activities}
+        # Ein Durchlauf: Key je Aktivität einmal parsen, spätere Zuordnungen überschreiben frühere
+        creation_dates = {
+            key: act['zeitstempel_iso'] for act in net_add_activities if (key := self._parse_key(act['neuer_wert']))
+        }
+        required_child_keys = creation_dates.keys()
         logger.info(f"{len(required_child_keys)} einzigartige Child-Issues durch Aktivitäten entdeckt.")
 
-        missing_keys = [key for key in required_child_keys if key and not os.path.exists(os.path.join(self.json_dir, f"{key}.json"))]
+        # Verzeichnis einmal auflisten statt pro Key ein exists()-Check
+        try:
+            with os.scandir(self.json_dir) as entries:
+                existing_keys = {e.name[:-5] for e in entries if e.name.endswith('.json')}
+        except FileNotFoundError:
+            existing_keys = set()
+        # Keys, die in diesem Lauf schon angefragt wurden (z.B. von einem anderen Epic), überspringen
+        missing_keys = [key for key in required_child_keys if key not in existing_keys and key not in self.fetched_keys]
 
         if missing_keys:
             if self.scraper:
@@ -179,42 +253,39 @@ class EpicTimelineAnalyzer:
                     print(f"Lade Issue {i+1}/{len(missing_keys)}: {key}")
                     issue_url = f"https://jira.telekom.de/browse/{key}"
                     self.scraper.extract_and_save_issue_data(issue_url, key)
+                self.fetched_keys.update(missing_keys)
                 print("--- Nachladen für dieses Epic abgeschlossen. ---")
             else:
                 logger.warning("Fehlende Issues gefunden, aber es wurde kein Scraper für das automatische Nachladen bereitgestellt.")
 
         logger.info("Analysiere Erstellungs- und Abschlussdaten für alle entdeckten Issues...")
         timeline_data = []
-        closed_stati = ['CLOSED', 'RESOLVED', 'DONE']
-        creation_dates = {self._parse_key(act['neuer_wert']): act['zeitstempel_iso'] for act in net_add_activities}
 
         for key in required_child_keys:
-            if not key: continue
-            file_path = os.path.join(self.json_dir, f"{key}.json")
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    issue_data = json.load(f)
-                    issue_type = issue_data.get("issue_type")
-                    if issue_type not in ['Story', 'Bug']:
-                        continue
-                    activities = issue_data.get('activities', [])
-                    closing_date = None
-                    close_events = [act['zeitstempel_iso'] for act in activities if act.get('feld_name') == 'Status' and self._clean_status_name(act.get('neuer_wert')) in closed_stati]
-                    if close_events:
-                        closing_date = min(close_events)
-                    timeline_data.append({
-                        "key": key,
-                        "type": issue_type,
-                        "creation_date": datetime.fromisoformat(creation_dates[key]),
-                        "closing_date": datetime.fromisoformat(closing_date) if closing_date else pd.NaT
-                    })
-            except (FileNotFoundError, json.JSONDecodeError):
+            issue_data = self._load_issue(key)
+            if issue_data is None:
                 continue
+            issue_type = issue_data.get("issue_type")
+            if issue_type not in ['Story', 'Bug']:
+                continue
+            # ISO-Zeitstempel sind lexikografisch sortierbar; das Minimum ist der erste Abschluss
+            closing_date = min(issue_data['_status_close_ts'], default=None)
+            timeline_data.append({
+                "key": key,
+                "type": issue_type,
+                "creation_date": creation_dates[key],
+                "closing_date": closing_date
+            })
 
         if not timeline_data:
             logger.warning(f"Keine gültigen 'Story'- oder 'Bug'-Issues zur Analyse für {self.epic_id} gefunden.")
             return None
-        return pd.DataFrame(timeline_data)
+
+        # ISO-Zeitstempel spaltenweise in einem Schritt umwandeln statt pro Zeile
+        df = pd.DataFrame(timeline_data)
+        df['creation_date'] = pd.to_datetime(df['creation_date'], utc=True, format='ISO8601')
+        df['closing_date'] = pd.to_datetime(df['closing_date'], utc=True, format='ISO8601')
+        return df
 
     def create_timeline_plot(self, df: pd.DataFrame):
         """Erstellt eine "Swimlane"-Grafik für neue und abgeschlossene Issues."""
@@ -222,8 +293,8 @@ class EpicTimelineAnalyzer:
 
         df['creation_month'] = df['creation_date'].dt.to_period('M')
         df['closing_month'] = df['closing_date'].dt.to_period('M')
-        new_pivot = pd.pivot_table(df, index='creation_month', columns='type', values='key', aggfunc='count', fill_value=0)
-        closed_pivot = pd.pivot_table(df.dropna(subset=['closing_date']), index='closing_month', columns='type', values='key', aggfunc='count', fill_value=0)
+        new_pivot = df.groupby(['creation_month', 'type']).size().unstack('type', fill_value=0)
+        closed_pivot = df.dropna(subset=['closing_date']).groupby(['closing_month', 'type']).size().unstack('type', fill_value=0)
 
         start_date = min(new_pivot.index.min(), closed_pivot.index.min()) if not closed_pivot.empty else new_pivot.index.min()
         full_date_range = pd.period_range(start=start_date, end=pd.to_datetime('today').to_period('M'), freq='M')
@@ -257,9 +328,6 @@ class EpicTimelineAnalyzer:
         ax2.set_xlabel("Monat")
         ax2.grid(axis='y', linestyle='--', alpha=0.7)
 
-        for container in ax2.containers:
-            ax2.bar_label(container, label_type='center', fontsize=10, color='white', fontweight='bold')
-
         ax2.set_xticklabels([p.strftime('%b %Y') for p in new_pivot.index], rotation=45, ha='right')
 
         legend_patches = [
@@ -359,6 +427,8 @@ if __name__ == '__main__':
         sys.exit(0)
 
     scraper_instance = None
+    # Über alle Epics geteilt, damit gemeinsame Child-Issues nur einmal angefragt werden
+    fetched_keys: set[str] = set()
     try:
         print("\n--- Initialisiere Jira-Session für alle anstehenden Operationen... ---")
         scraper_instance = JiraScraper(
@@ -383,18 +453,17 @@ if __name__ == '__main__':
             print(f" Verarbeite Epic {i+1}/{len(epics_to_process)}: {epic_id}")
             print(f"==================================================================")
 
-            analyzer = EpicTimelineAnalyzer(epic_id=epic_id, scraper=scraper_instance)
+            analyzer = EpicTimelineAnalyzer(epic_id=epic_id, scraper=scraper_instance, fetched_keys=fetched_keys)
             df_timeline = analyzer.analyze_timeline()
 
             # KORREKTUR: Der folgende Block wurde NACH INNEN in die Schleife verschoben.
             # ------------------- START DES VERSCHOBENEN BLOCKS -------------------
             if df_timeline is not None and not df_timeline.empty:
                 print(f"\n--- Analyse der Timeline von {len(df_timeline)} Stories & Bugs für {epic_id} ---")
-                df_timeline['creation_date'] = pd.to_datetime(df_timeline['creation_date'], utc=True)
-                df_timeline['closing_date'] = pd.to_datetime(df_timeline['closing_date'], utc=True)
 
-                new_pivot = pd.pivot_table(df_timeline, index=df_timeline['creation_date'].dt.to_period('M'), columns='type', values='key', aggfunc='count', fill_value=0)
-                closed_pivot = pd.pivot_table(df_timeline.dropna(subset=['closing_date']), index=df_timeline.dropna(subset=['closing_date'])['closing_date'].dt.to_period('M'), columns='type', values='key', aggfunc='count', fill_value=0)
+                closed_df = df_timeline.dropna(subset=['closing_date'])
+                new_pivot = df_timeline.groupby([df_timeline['creation_date'].dt.to_period('M'), 'type']).size().unstack('type', fill_value=0)
+                closed_pivot = closed_df.groupby([closed_df['closing_date'].dt.to_period('M'), 'type']).size().unstack('type', fill_value=0)
 
                 print("\n=== Monatlich neu erstellte Issues ===")
                 print(new_pivot)
@@ -119,19 +119,22 @@ class HtmlTranslator:
             response = self.ai_client.completion(
                 model_name=self.model_name,
                 user_prompt=user_prompt_json,
-                temperature=0.1,
+                temperature=0,
                 max_tokens=4096,
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                use_cache=True
             )
 
-            self.token_tracker.log_usage(
-                model=self.model_name,
-                input_tokens=response['usage'].prompt_tokens,
-                output_tokens=response['usage'].completion_tokens,
-                total_tokens=response['usage'].total_tokens,
-                task_name="html_translation",
-                entity_id=issue_key
-            )
+            # Bei einem Treffer im LLM-Cache fällt kein Token-Verbrauch an
+            if 'usage' in response:
+                self.token_tracker.log_usage(
+                    model=self.model_name,
+                    input_tokens=response['usage'].prompt_tokens,
+                    output_tokens=response['usage'].completion_tokens,
+                    total_tokens=response['usage'].total_tokens,
+                    task_name="html_translation",
+                    entity_id=issue_key
+                )
 
             # --- PHASE 3: Antwort verarbeiten und Inhalte wieder einfügen ---
             translated_data = json.loads(response['text'])
@@ -159,7 +162,7 @@ class HtmlTranslator:
             return
 
         # Speichere die übersetzte HTML-Datei
-        with open(output_filepath, "w", encoding='utf-8') as f:
+        with open(output_filepath, "w", encoding='utf-8', buffering=65536) as f:
             f.write(str(soup))
 
         logging.info(f"Übersetzte Datei erfolgreich gespeichert: {output_filepath}\n")
@@ -2,6 +2,8 @@
 import os
 import requests
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 def _load_dotenv():
     """
@@ -46,7 +48,15 @@ class JiraApiClient:
             raise RuntimeError("No API token found. Set JIRA_API_TOKEN (or JIRA_TOKEN) "
                                "in your environment or .env file.")
 
+        # One pooled keep-alive session for all calls; large enough for parallel
+        # fetches, with backoff retries on rate limits and gateway errors
         self.s = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=20, pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504]),
+        )
+        self.s.mount("https://", adapter)
+        self.s.mount("http://", adapter)
         self.s.headers.update({
             "Authorization": f"Bearer {token}",
             "Accept": "application/json"
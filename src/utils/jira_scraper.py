@@ -69,8 +69,8 @@ class JiraScraper:
     # __init__ bleibt unverändert
     def __init__(self, url, email, model="o3-mini", token_tracker=None, azure_client=None, scrape_mode='true', check_days=7):
 
-        from dotenv import load_dotenv, find_dotenv
-        _ = load_dotenv(find_dotenv())
+        from utils.env import ensure_env
+        ensure_env()
         self.url = url
         self.email = email
         self.pwd = os.getenv("JIRA_LOGIN_PWD")
@@ -213,7 +213,7 @@ class JiraScraper:
                 return None
 
             html_content = self.driver.page_source
-            issue_data = self.data_extractor.extract_issue_data(self.driver, issue_key)
+            issue_data = self.data_extractor.extract_issue_data(self.driver, issue_key, html_content)
             issue_data['activities'] = self.data_extractor.extract_activity_details(html_content)
             FileExporter.process_and_save_issue(self.driver, issue_key, html_content, issue_data)
             self.processed_issues.add(issue_key)
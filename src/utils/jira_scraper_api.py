@@ -25,6 +25,9 @@ class JiraScraper:
       - parent_link (added in enrichment pass)
     """
 
+    # Fields requested per issue; passed explicitly to keep REST payloads small
+    ISSUE_FIELDS = "summary,description,issuetype,status,assignee,duedate,fixVersions,created,updated,subtasks,issuelinks"
+
     def __init__(self, url, email, model="o3-mini", token_tracker=None, azure_client=None, scrape_mode='true', check_days=7):
         self.url = url
         self.email = email
@@ -197,16 +200,8 @@ class JiraScraper:
 
         try:
             logger.info(f"Fetching {issue_key} via REST API" + (" (Retry)" if is_retry else ""))
-            raw = self.client.get_issue(issue_key,
-                                        fields="summary,description,issuetype,status,assignee,duedate,fixVersions,created,updated,subtasks,issuelinks")
-            data = self._normalize_issue(raw)
-
-            # write JSON file
-            with open(self._issue_file(issue_key), "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-
-            self.processed_issues.add(issue_key)
-            return data
+            raw = self.client.get_issue(issue_key, fields=self.ISSUE_FIELDS)
+            return self._save_issue(raw)
 
         except Exception as e:
             if is_retry:
@@ -217,6 +212,25 @@ class JiraScraper:
             self.issues_to_retry[issue_key] = issue_url
             return None
 
+    def _save_issue(self, raw):
+        """Normalize a raw REST issue, write its JSON file and mark it processed."""
+        data = self._normalize_issue(raw)
+        with open(self._issue_file(data["key"]), "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        self.processed_issues.add(data["key"])
+        return data
+
+    def _batch_fetch(self, keys):
+        """
+        Fetch several issues with a single JQL search (`issueKey in (...)`)
+        instead of one GET per key. Returns {key: data} for the issues the
+        API returned; missing keys are simply absent from the result.
+        """
+        jql = f"issueKey in ({','.join(keys)})"
+        logger.info(f"Fetching {len(keys)} issues via JQL batch search")
+        issues = self.client.search(jql, fields=self.ISSUE_FIELDS, max_results=len(keys))
+        return {raw["key"]: self._save_issue(raw) for raw in issues}
+
     def process_related_issues(self, issue_data, current_url, is_retry=False):
         """
         Iterative DFS to avoid recursion depth errors and infinite loops.
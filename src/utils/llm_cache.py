@@ -0,0 +1,48 @@
+# src/utils/llm_cache.py
+import hashlib
+import json
+import os
+import tempfile
+from utils.logger_config import logger
+from utils.config import LLM_CACHE_DIR
+
+
+def make_key(**parts) -> str:
+    """Bildet den Cache-Schlüssel (SHA-256) aus Modell, Prompt und Antwortformat."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _path(key: str) -> str:
+    return os.path.join(LLM_CACHE_DIR, f"{key}.json")
+
+
+def get(key: str) -> dict | None:
+    """Liefert eine gecachte LLM-Antwort oder None."""
+    try:
+        with open(_path(key), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, OSError) as e:
+        logger.info(f"LLM-Cache-Eintrag {key} ist nicht lesbar ({e}).")
+        return None
+
+
+def set(key: str, response: dict):
+    """
+    Speichert eine LLM-Antwort; geschrieben wird atomar über eine Temp-Datei.
+
+    Jeder Aufruf erhält eine eigene Temp-Datei, damit parallele Worker-Threads
+    mit demselben Schlüssel sich nicht gegenseitig die Datei abschneiden.
+    """
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=LLM_CACHE_DIR,
+                                     prefix=f"{key}.", suffix=".tmp", delete=False) as f:
+        tmp_path = f.name
+        try:
+            json.dump(response, f, ensure_ascii=False)
+        except BaseException:
+            f.close()
+            os.unlink(tmp_path)
+            raise
+    os.replace(tmp_path, _path(key))
@@ -1,11 +1,21 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 from utils.config import LOGS_DIR
 
+# Name des Kind-Loggers für Fortschrittsmeldungen, die auch im Terminal erscheinen
+PROGRESS_LOGGER_NAME = "jira_scraper.progress"
+
 def setup_logger():
     """
     Konfiguriert den Logger mit separaten Loglevels für Datei und Konsole.
+
+    Die Log-Records werden über eine Queue an einen Listener-Thread übergeben,
+    der die eigentlichen Datei- und Konsolen-Handler bedient. Aufrufer blockieren
+    so nicht auf langsamen write()-Aufrufen (z.B. bei umgeleitetem stdout in CI).
     """
     # Logger-Instanz holen
     logger = logging.getLogger("jira_scraper")
@@ -28,16 +38,26 @@ def setup_logger():
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(formatter)
 
-    # 2. Console Handler: Gibt alles ab WARNING-Level im Terminal aus
+    # 2. Console Handler: Gibt alles ab WARNING-Level im Terminal aus,
+    #    Fortschrittsmeldungen des Progress-Loggers zusätzlich ab INFO
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.WARNING)
+    console_handler.setLevel(logging.INFO)
+    console_handler.addFilter(
+        lambda record: record.levelno >= logging.WARNING or record.name == PROGRESS_LOGGER_NAME
+    )
     console_handler.setFormatter(formatter)
 
-    # Handler zum Logger hinzufügen
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # Handler asynchron über Queue + Listener anbinden
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
 
     return logger
 
 # Erstelle eine globale Logger-Instanz, die überall importiert werden kann
 logger = setup_logger()
+
+# Fortschrittsmeldungen (z.B. pro Epic): landen über den Eltern-Logger in Datei und Konsole
+progress_logger = logging.getLogger(PROGRESS_LOGGER_NAME)
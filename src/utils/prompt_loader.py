@@ -1,10 +1,16 @@
 import os
 import sys
+import functools
 import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml-Parser, deutlich schneller
+except ImportError:
+    from yaml import SafeLoader
 from .logger_config import logger # Annahme, dass logger_config in utils liegt
 
 from utils.config import PROMPTS_DIR
 
+@functools.lru_cache(maxsize=None)
 def load_prompt_template(filename: str, key: str) -> str:
     """
     Lädt eine Prompt-Vorlage aus einer YAML-Datei im PROMPTS_DIR.
@@ -15,11 +21,14 @@ def load_prompt_template(filename: str, key: str) -> str:
 
     Returns:
         str: Die geladene Prompt-Vorlage als String.
+
+    Das Ergebnis wird pro (filename, key) zwischengespeichert; jede
+    Prompt-Datei wird also nur einmal pro Prozess gelesen.
     """
     file_path = os.path.join(PROMPTS_DIR, filename)
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
-            prompts = yaml.safe_load(file)
+            prompts = yaml.load(file, Loader=SafeLoader)
             return prompts[key]
     except FileNotFoundError:
         logger.error(f"Prompt-Datei nicht gefunden: {file_path}")
@@ -0,0 +1,99 @@
+# src/utils/rate_limiter.py
+import random
+import threading
+import time
+from collections import deque
+
+from openai import RateLimitError
+
+from utils.logger_config import logger
+from utils.config import LLM_RPM_LIMIT, LLM_TPM_LIMIT, LLM_MAX_RETRIES
+
+
+def estimate_tokens(text: str) -> int:
+    """Grobe Schätzung der Prompt-Tokens (ca. 4 Zeichen pro Token)."""
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """
+    Präventiver Rate-Limiter für LLM-Aufrufe mit gleitendem 60-Sekunden-Fenster.
+
+    Vor jedem Aufruf wird geprüft, ob Requests pro Minute (RPM) und geschätzte
+    Tokens pro Minute (TPM) noch im Limit liegen; andernfalls wird gewartet,
+    bis ältere Einträge aus dem Fenster fallen. Nach dem Aufruf wird die
+    Schätzung mit dem tatsächlichen Verbrauch abgeglichen. Threadsicher, damit
+    parallele Worker sich dasselbe Kontingent teilen.
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(self, rpm: int = LLM_RPM_LIMIT, tpm: int = LLM_TPM_LIMIT):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._lock = threading.Lock()
+        self._events = deque()  # Einträge: [zeitstempel, tokens]
+        self._tokens_in_window = 0
+
+    def _evict(self, now: float):
+        while self._events and now - self._events[0][0] >= self.WINDOW_SECONDS:
+            _, tokens = self._events.popleft()
+            self._tokens_in_window -= tokens
+
+    def acquire(self, estimated_tokens: int) -> list:
+        """Blockiert, bis der Aufruf ins Kontingent passt, und reserviert ihn."""
+        estimated_tokens = min(estimated_tokens, self.tpm)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._evict(now)
+                if len(self._events) < self.rpm and self._tokens_in_window + estimated_tokens <= self.tpm:
+                    entry = [now, estimated_tokens]
+                    self._events.append(entry)
+                    self._tokens_in_window += estimated_tokens
+                    return entry
+                wait = self.WINDOW_SECONDS - (now - self._events[0][0])
+            time.sleep(max(wait, 0.05))
+
+    def reconcile(self, entry: list, actual_tokens: int):
+        """Ersetzt die Schätzung eines reservierten Aufrufs durch den echten Verbrauch."""
+        with self._lock:
+            if entry in self._events:
+                self._tokens_in_window += actual_tokens - entry[1]
+                entry[1] = actual_tokens
+
+    def call(self, fn, estimated_tokens: int, *args, **kwargs):
+        """
+        Führt `fn(*args, **kwargs)` innerhalb des Limits aus.
+
+        Schlägt der Aufruf trotzdem mit einem 429 fehl, wird mit zufälligem
+        exponentiellem Backoff (1-60 s) bis zu LLM_MAX_RETRIES-mal wiederholt.
+        """
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            entry = self.acquire(estimated_tokens)
+            try:
+                response = fn(*args, **kwargs)
+            except RateLimitError:
+                if attempt == LLM_MAX_RETRIES:
+                    raise
+                delay = random.uniform(1, min(60, 2 ** (attempt + 1)))
+                logger.warning(f"Rate-Limit erreicht (Versuch {attempt + 1}). Warte {delay:.1f}s.")
+                time.sleep(delay)
+                continue
+            usage = getattr(response, "usage", None)
+            if usage is not None and getattr(usage, "total_tokens", None):
+                self.reconcile(entry, usage.total_tokens)
+            return response
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(model_name: str) -> TokenBucket:
+    """Liefert den prozessweit geteilten Limiter für ein Modell."""
+    with _limiters_lock:
+        limiter = _limiters.get(model_name)
+        if limiter is None:
+            limiter = _limiters[model_name] = TokenBucket()
+        return limiter
@@ -0,0 +1,57 @@
+# src/utils/summary_cache.py
+import orjson
+import sqlite3
+import threading
+from utils.logger_config import logger
+from utils.config import SUMMARY_CACHE_FILE
+
+
+class SummaryCache:
+    """
+    Persistenter Key-Value-Speicher für die vollständigen Epic-Zusammenfassungen.
+
+    Statt einer JSON-Datei pro Epic werden alle Zusammenfassungen in einer
+    einzigen SQLite-Datenbank (WAL-Modus) abgelegt, Schlüssel ist die Epic-ID.
+    Ein Cache-Treffer ist damit ein einzelner indizierter Lookup über eine
+    offene Verbindung. Die Verbindung wird von mehreren Worker-Threads geteilt,
+    alle Zugriffe laufen daher über einen Lock.
+    """
+
+    def __init__(self, db_path: str = SUMMARY_CACHE_FILE):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS summaries (epic_id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+        self.conn.commit()
+
+    def get(self, epic_id: str) -> dict | None:
+        """Liefert die gecachte Zusammenfassung eines Epics oder None."""
+        with self._lock:
+            row = self.conn.execute("SELECT data FROM summaries WHERE epic_id = ?", (epic_id,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return orjson.loads(row[0])
+        except orjson.JSONDecodeError as e:
+            logger.info(f"Cache-Eintrag für {epic_id} ist nicht lesbar ({e}).")
+            return None
+
+    def set(self, epic_id: str, data: dict):
+        """Speichert (oder ersetzt) die Zusammenfassung eines Epics."""
+        payload = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO summaries (epic_id, data) VALUES (?, ?)",
+                (epic_id, payload)
+            )
+            self.conn.commit()
+
+    def delete(self, epic_id: str):
+        """Entfernt den Eintrag eines Epics aus dem Cache."""
+        with self._lock:
+            self.conn.execute("DELETE FROM summaries WHERE epic_id = ?", (epic_id,))
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -21,6 +21,7 @@ Key features:
 import json
 import os
 import datetime
+import threading
 import argparse
 from typing import Dict, List, Optional, Tuple, Union
 import pandas as pd
@@ -110,6 +111,9 @@ class TokenUsage:
             # Stelle sicher, dass das Verzeichnis existiert
             self.log_file_path.parent.mkdir(exist_ok=True, parents=True)
 
+        # Serialisiert die Schreibzugriffe, wenn mehrere Worker-Threads loggen
+        self._lock = threading.Lock()
+
     def log_usage(self,
                  model: str,
                  input_tokens: int,
@@ -162,7 +166,7 @@ class TokenUsage:
             usage_entry["metadata"] = metadata
 
         # Schreibe den Eintrag in die Log-Datei (im JSONL-Format: eine JSON-Zeile pro Eintrag)
-        with open(self.log_file_path, "a", encoding="utf-8") as log_file:
+        with self._lock, open(self.log_file_path, "a", encoding="utf-8") as log_file:
             log_file.write(json.dumps(usage_entry) + "\n")
 
         return usage_entry